@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import threading
+import aiohttp
+import orjson
+from config import TradingConfig
+from binance_client import binance_client, klines_to_dataframe
+
+FAPI_BASE_URL = 'https://fapi.binance.com'
+
+class AsyncBinanceClient:
+    """Async market-data client for the concurrent symbol scan.
+
+    Signed endpoints (orders, leverage, positions) stay on the sync
+    BinanceClient; this client only covers public market-data calls where
+    the win is issuing many requests within one round-trip of wall time
+    instead of one round-trip per symbol.
+    """
+
+    def __init__(self, max_concurrency=20):
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    async def _get_session(self):
+        """Lazily create the long-lived session inside the running loop"""
+        if self._session is None or self._session.closed:
+            # keepalive must outlive the gap between scan cycles or every
+            # cycle re-handshakes its whole connection fan-out
+            connector = aiohttp.TCPConnector(limit=100, ttl_dns_cache=300,
+                                             keepalive_timeout=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the underlying session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get(self, path, params, weight=1):
+        """Issue a GET request under the concurrency semaphore.
+
+        Draws from the sync client's token bucket so concurrent fetches
+        burst within the same global weight budget as the REST calls.
+        """
+        session = await self._get_session()
+        while True:
+            wait = binance_client._bucket.try_acquire(weight)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+        async with self._semaphore:
+            async with session.get(FAPI_BASE_URL + path, params=params) as resp:
+                if resp.status != 200:
+                    logging.error(f"HTTP {resp.status} for {path} {params}")
+                    return None
+                return orjson.loads(await resp.read())
+
+    async def get_klines(self, symbol, interval='15m', limit=200):
+        """Get klines for one symbol as a DataFrame (same shape as sync client)"""
+        try:
+            raw = await self._get('/fapi/v1/klines',
+                                  {'symbol': symbol, 'interval': interval, 'limit': limit},
+                                  weight=2)
+            if not raw:
+                return None
+            return klines_to_dataframe(raw)
+        except Exception as e:
+            logging.error(f"Async klines error for {symbol}: {str(e)}")
+            return None
+
+    async def get_current_price(self, symbol):
+        """Get current price for a symbol"""
+        try:
+            resp = await self._get('/fapi/v1/ticker/price', {'symbol': symbol})
+            if resp and 'price' in resp:
+                return float(resp['price'])
+            return None
+        except Exception as e:
+            logging.error(f"Async price error for {symbol}: {str(e)}")
+            return None
+
+    async def get_tickers_usdt(self):
+        """Get USDT trading pairs (same filtering as the sync client)"""
+        try:
+            resp = await self._get('/fapi/v1/ticker/price', None)
+            if not resp or not isinstance(resp, list):
+                return []
+            tickers = []
+            for elem in resp:
+                symbol = elem.get('symbol', '')
+                if binance_client.validate_symbol(symbol) and symbol not in ['USDCUSDT', 'BUSDUSDT']:
+                    tickers.append(symbol)
+            return tickers[:200]
+        except Exception as e:
+            logging.error(f"Async tickers error: {str(e)}")
+            return []
+
+    async def get_klines_batch(self, symbols, interval='15m', limit=200):
+        """Fetch klines for many symbols concurrently, returning {symbol: DataFrame}"""
+        tasks = [self.get_klines(symbol, interval, limit) for symbol in symbols]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        klines = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logging.error(f"Kline fetch failed for {symbol}: {str(result)}")
+            elif result is not None:
+                klines[symbol] = result
+        return klines
+
+# Background event loop hosting the shared client so its keep-alive
+# connections survive between scan cycles
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop():
+    """Lazily start the daemon thread running the shared event loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True).start()
+    return _loop
+
+def fetch_klines_sync(symbols, interval=None, limit=200):
+    """Run a concurrent kline fetch from synchronous code.
+
+    Submits the batch to the persistent background loop, so the shared
+    session's warm connections are reused across cycles instead of
+    being opened and torn down per batch.
+    """
+    interval = interval or TradingConfig.KLINE_INTERVAL
+    future = asyncio.run_coroutine_threadsafe(
+        async_client.get_klines_batch(symbols, interval, limit), _get_loop())
+    return future.result()
+
+# Global async client instance
+async_client = AsyncBinanceClient()
@@ -1,33 +1,153 @@
 import logging
+import re
+import threading
+import time
+import numpy as np
+import orjson
 import pandas as pd
-from datetime import datetime
-from time import sleep
+from time import monotonic, sleep
 from binance.um_futures import UMFutures
 from binance.error import ClientError
 from config import TradingConfig
 from notifications import notifier
 
+# Request weights per endpoint (Binance USDT-M futures docs)
+API_WEIGHTS = {
+    'get_balance': 5,
+    'get_tickers': 40,
+    'klines': 2,
+    'set_leverage': 1,
+    'set_mode': 1,
+    'place_order': 1,
+    'get_positions': 5,
+    'get_orders': 5,
+    'exchange_info': 1,
+    'cancel_order': 1,
+    'get_price': 1,
+}
+
+# On-disk snapshot of exchange_info so restarts skip the cold ~1MB fetch
+EXCHANGE_INFO_CACHE = 'exchange_info_cache.json'
+
+# Refresh window for the slow-moving metadata caches (exchange info,
+# volume-ranked tickers)
+METADATA_TTL = 3600
+
+# Compiled once: uppercase alphanumeric base of at least 2 chars + USDT
+# suffix, equivalent to the old length/endswith checks in a single match
+_SYMBOL_RE = re.compile(r'[A-Z0-9]{2,}USDT')
+
+class TokenBucket:
+    """Lazy token bucket over the shared Binance request-weight budget.
+
+    Refills on each acquire from time.monotonic() instead of sleeping a
+    fixed interval per call, so independent endpoints can pipeline
+    back-to-back while bursts still stay under the weight limit.
+    """
+
+    def __init__(self, rate=2400 / 60.0, capacity=2400):
+        self.rate = rate
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.last_refill = monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, weight=1):
+        """Take `weight` tokens if available, else return the wait needed.
+
+        Non-blocking so async callers can await the wait instead of
+        stalling the event loop.
+        """
+        with self._lock:
+            now = monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= weight:
+                self.tokens -= weight
+                return 0.0
+            return (weight - self.tokens) / self.rate
+
+    def acquire(self, weight=1):
+        """Take `weight` tokens, sleeping only when the budget is exhausted"""
+        while True:
+            wait = self.try_acquire(weight)
+            if not wait:
+                return
+            sleep(wait)
+
+def klines_to_arrays(raw):
+    """Parse a raw klines response into (timestamps, ohlcv) NumPy arrays.
+
+    Returns an int64 timestamp array and a float64 array of shape (n, 5)
+    with Open/High/Low/Close/Volume columns, or None on bad data. Skips
+    pandas entirely so batch consumers pay no DataFrame construction cost.
+    """
+    if not raw or len(raw[0]) < 6:
+        return None
+
+    arr = np.asarray(raw, dtype=object)
+    ts = arr[:, 0].astype(np.int64)
+    ohlcv = arr[:, 1:6].astype(np.float64)
+
+    # Single min-reduction, no boolean temporary
+    if ohlcv.min() <= 0:
+        return None
+
+    return ts, ohlcv
+
+def klines_to_dataframe(raw):
+    """Convert a raw klines response into a validated OHLCV DataFrame"""
+    parsed = klines_to_arrays(raw)
+    if parsed is None:
+        return None
+
+    ts, ohlcv = parsed
+    # Build from pre-parsed float64 columns: no object blocks, no dtype
+    # inference, no post-hoc astype pass. The int64-ms timestamps become
+    # datetime64[ms] with a zero-copy view instead of pd.to_datetime's
+    # per-element Timestamp path
+    index = pd.DatetimeIndex(ts.view('datetime64[ms]'), name='Time')
+    return pd.DataFrame(ohlcv, index=index,
+                        columns=['Open', 'High', 'Low', 'Close', 'Volume'],
+                        copy=False)
+
 class BinanceClient:
     """Enhanced Binance client with security and validation"""
     
     def __init__(self):
         self.client = UMFutures(key=TradingConfig.API_KEY, secret=TradingConfig.SECRET_KEY)
-        self.last_api_call = {}
-        
+        # The connector keeps a requests.Session internally; mount a larger
+        # connection pool so bursty call sequences reuse warm keep-alive TLS
+        # sockets instead of re-handshaking
+        try:
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            # Retry only idempotent-safe gateway errors, with a short
+            # backoff so a blipped proxy does not stall the loop
+            retries = Retry(total=2, backoff_factor=0.05,
+                            status_forcelist=[502, 503, 504],
+                            allowed_methods=['GET'])
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                                  max_retries=retries)
+            self.client.session.mount('https://', adapter)
+        except Exception as e:
+            logging.warning(f"Could not tune HTTP connection pool: {e}")
+        self._bucket = TokenBucket()
+        self._symbol_info = None
+        self._symbol_info_bucket = None
+        self._tick_cache = {}  # symbol -> (snapshot bucket, (tick_inv, step_inv))
+        self._limits_cache = {}  # symbol -> (snapshot bucket, (minQty, minNotional))
+        self._balance_cache = None  # (monotonic time, balance)
+        self._ranked_tickers = None
+        self._ranked_tickers_bucket = None
+
     def rate_limit_check(self, function_name):
-        """Implement rate limiting for API calls"""
-        current_time = datetime.now()
-        if function_name in self.last_api_call:
-            time_diff = (current_time - self.last_api_call[function_name]).total_seconds()
-            if time_diff < TradingConfig.MIN_API_INTERVAL:
-                sleep(TradingConfig.MIN_API_INTERVAL - time_diff)
-        self.last_api_call[function_name] = datetime.now()
+        """Throttle API calls against the shared weight budget"""
+        self._bucket.acquire(API_WEIGHTS.get(function_name, 1))
     
     def validate_symbol(self, symbol):
         """Validate symbol format"""
-        if not isinstance(symbol, str) or len(symbol) < 6 or not symbol.endswith('USDT'):
-            return False
-        return True
+        return isinstance(symbol, str) and _SYMBOL_RE.fullmatch(symbol) is not None
     
     def validate_connection(self):
         """Validate connection to Binance API"""
@@ -39,8 +159,18 @@ class BinanceClient:
             logging.error(f"Connection to Binance API failed: {e}")
             return False
     
-    def get_balance_usdt(self):
-        """Get USDT balance with validation"""
+    def get_balance_usdt(self, max_age=2.0):
+        """Get USDT balance with validation.
+
+        Bursty callers (several order attempts in one scan) reuse the
+        last figure for `max_age` seconds instead of hitting the account
+        endpoint each time; pass max_age=0 to force a refresh.
+        """
+        if self._balance_cache is not None and max_age:
+            ts, balance = self._balance_cache
+            if monotonic() - ts <= max_age:
+                return balance
+
         self.rate_limit_check('get_balance')
         try:
             # Try account info first (more reliable for futures)
@@ -48,6 +178,7 @@ class BinanceClient:
             if response and 'totalWalletBalance' in response:
                 balance = float(response['totalWalletBalance'])
                 logging.info(f"Account balance from totalWalletBalance: {balance}")
+                self._balance_cache = (monotonic(), balance)
                 return balance
             
             # Fallback to balance method
@@ -61,6 +192,7 @@ class BinanceClient:
                     balance = float(elem.get('balance', 0))
                     if balance < 0 or balance > 1000000:
                         logging.warning(f"Unusual balance detected: {balance}")
+                    self._balance_cache = (monotonic(), balance)
                     return balance
             return 0.0
 
@@ -71,24 +203,37 @@ class BinanceClient:
             logging.error(f"Unexpected balance error: {str(e)}")
             return None
     
-    def get_tickers_usdt(self):
-        """Get USDT trading pairs with validation"""
+    def get_tickers_usdt(self, top=200):
+        """Get USDT pairs ranked by 24h quote volume, refreshed hourly.
+
+        Ranking by traded volume (instead of Binance's alphabetical
+        order) means any downstream cap keeps the most liquid symbols.
+        """
+        bucket = int(time.time() // METADATA_TTL)
+        if self._ranked_tickers is not None and bucket == self._ranked_tickers_bucket:
+            return self._ranked_tickers
+
         self.rate_limit_check('get_tickers')
         try:
-            resp = self.client.ticker_price()
+            resp = self.client.ticker_24hr_price_change()
             if not resp or not isinstance(resp, list):
                 logging.error("Invalid ticker response format")
                 return []
-                
-            tickers = []
-            for elem in resp:
-                symbol = elem.get('symbol', '')
-                if self.validate_symbol(symbol) and symbol not in ['USDCUSDT', 'BUSDUSDT']:
-                    tickers.append(symbol)
-            
-            logging.info(f"Retrieved {len(tickers)} valid USDT pairs")
-            return tickers[:200]
-            
+
+            ranked = sorted(
+                (elem for elem in resp
+                 if self.validate_symbol(elem.get('symbol', ''))
+                 and elem['symbol'] not in ['USDCUSDT', 'BUSDUSDT']),
+                key=lambda elem: float(elem.get('quoteVolume', 0)),
+                reverse=True
+            )
+            tickers = [elem['symbol'] for elem in ranked[:top]]
+
+            self._ranked_tickers = tickers
+            self._ranked_tickers_bucket = bucket
+            logging.info(f"Retrieved {len(tickers)} USDT pairs ranked by 24h volume")
+            return tickers
+
         except ClientError as error:
             logging.error(f"Ticker error: {error.status_code}, {error.error_code}, {error.error_message}")
             return []
@@ -101,47 +246,144 @@ class BinanceClient:
             
         self.rate_limit_check('klines')
         try:
-            resp = pd.DataFrame(self.client.klines(symbol, interval, limit=limit))
-            if resp.empty or len(resp.columns) < 6:
+            resp = klines_to_dataframe(self.client.klines(symbol, interval, limit=limit))
+            if resp is None:
                 logging.error(f"Invalid klines data for {symbol}")
                 return None
-                
-            resp = resp.iloc[:,:6]
-            resp.columns = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume']
-            resp = resp.set_index('Time')
-            resp.index = pd.to_datetime(resp.index, unit='ms')
-            resp = resp.astype(float)
-            
-            if (resp <= 0).any().any():
-                logging.error(f"Invalid price data detected for {symbol}")
-                return None
-                
             return resp
         except ClientError as error:
             logging.error(f"Klines error for {symbol}: {error.status_code}, {error.error_code}, {error.error_message}")
             return None
-    
-    def get_price_precision(self, symbol):
-        """Get price precision for symbol"""
+
+    def get_klines_arrays(self, symbol, interval='15m', limit=200):
+        """Get klines as (timestamps, ohlcv) NumPy arrays for batch consumers"""
+        if not self.validate_symbol(symbol):
+            logging.error(f"Invalid symbol: {symbol}")
+            return None
+
+        self.rate_limit_check('klines')
         try:
-            resp = self.client.exchange_info()['symbols']
-            for elem in resp:
-                if elem['symbol'] == symbol:
-                    return elem['pricePrecision']
-        except Exception as e:
-            logging.error(f"Error getting price precision for {symbol}: {e}")
+            parsed = klines_to_arrays(self.client.klines(symbol, interval, limit=limit))
+            if parsed is None:
+                logging.error(f"Invalid klines data for {symbol}")
+            return parsed
+        except ClientError as error:
+            logging.error(f"Klines error for {symbol}: {error.status_code}, {error.error_code}, {error.error_message}")
             return None
-    
-    def get_qty_precision(self, symbol):
-        """Get quantity precision for symbol"""
+
+    def exchange_info_snapshot(self):
+        """Get the symbol -> exchange metadata dict, refreshed hourly.
+
+        exchange_info() is a ~1MB mostly-static payload; fetch it once per
+        hour and serve precision lookups from the cached dict.
+        """
+        bucket = int(time.time() // METADATA_TTL)
+        if self._symbol_info is None or bucket != self._symbol_info_bucket:
+            # Cold start: reuse the on-disk snapshot if it is still fresh
+            if self._symbol_info is None:
+                cached = self._load_snapshot_from_disk(bucket)
+                if cached is not None:
+                    self._symbol_info = cached
+                    self._symbol_info_bucket = bucket
+                    logging.info("Loaded exchange info snapshot from disk cache")
+                    return self._symbol_info
+
+            self.rate_limit_check('exchange_info')
+            try:
+                info = self.client.exchange_info()
+                self._symbol_info = {s['symbol']: s for s in info['symbols']}
+                self._symbol_info_bucket = bucket
+                self._save_snapshot_to_disk(bucket)
+            except Exception as e:
+                logging.error(f"Error fetching exchange info: {e}")
+                if self._symbol_info is None:
+                    return {}
+        return self._symbol_info
+
+    def _load_snapshot_from_disk(self, bucket):
+        """Load the exchange info snapshot from disk if it matches `bucket`"""
         try:
-            resp = self.client.exchange_info()['symbols']
-            for elem in resp:
-                if elem['symbol'] == symbol:
-                    return elem['quantityPrecision']
+            with open(EXCHANGE_INFO_CACHE, 'rb') as f:
+                cached = orjson.loads(f.read())
+            if cached.get('bucket') == bucket:
+                return cached['symbols']
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save_snapshot_to_disk(self, bucket):
+        """Persist the exchange info snapshot for the next restart"""
+        try:
+            with open(EXCHANGE_INFO_CACHE, 'wb') as f:
+                f.write(orjson.dumps({'bucket': bucket, 'symbols': self._symbol_info}))
         except Exception as e:
-            logging.error(f"Error getting qty precision for {symbol}: {e}")
-            return None
+            logging.warning(f"Could not persist exchange info cache: {e}")
+
+    def get_price_precision(self, symbol):
+        """Get price precision for symbol"""
+        return self.exchange_info_snapshot().get(symbol, {}).get('pricePrecision')
+
+    def get_qty_precision(self, symbol):
+        """Get quantity precision for symbol"""
+        return self.exchange_info_snapshot().get(symbol, {}).get('quantityPrecision')
+
+    def get_precisions(self, symbol):
+        """Get (quantityPrecision, pricePrecision) in one snapshot lookup"""
+        info = self.exchange_info_snapshot().get(symbol, {})
+        return info.get('quantityPrecision'), info.get('pricePrecision')
+
+    def get_tick_inverses(self, symbol):
+        """Get (1/tickSize, 1/stepSize) as integers for grid arithmetic.
+
+        Prices must land on tickSize multiples and quantities on stepSize
+        multiples; snapping with integer inverses avoids float-rounding
+        drift. Parsed filters are cached per snapshot bucket. Returns
+        (None, None) when the symbol or its filters are unknown.
+        """
+        cached = self._tick_cache.get(symbol)
+        if cached is not None and cached[0] == self._symbol_info_bucket:
+            return cached[1]
+
+        info = self.exchange_info_snapshot().get(symbol)
+        if not info:
+            return None, None
+
+        tick_inv = step_inv = None
+        for f in info.get('filters', []):
+            if f.get('filterType') == 'PRICE_FILTER' and float(f.get('tickSize', 0)) > 0:
+                tick_inv = int(round(1 / float(f['tickSize'])))
+            elif f.get('filterType') == 'LOT_SIZE' and float(f.get('stepSize', 0)) > 0:
+                step_inv = int(round(1 / float(f['stepSize'])))
+
+        result = (tick_inv, step_inv)
+        self._tick_cache[symbol] = (self._symbol_info_bucket, result)
+        return result
+
+    def get_min_order_limits(self, symbol):
+        """Get (minQty, minNotional) for local order pre-validation.
+
+        Cached per snapshot bucket like the tick filters, so rejecting an
+        undersized order costs no network round-trip.
+        """
+        cached = self._limits_cache.get(symbol)
+        if cached is not None and cached[0] == self._symbol_info_bucket:
+            return cached[1]
+
+        info = self.exchange_info_snapshot().get(symbol)
+        if not info:
+            return None, None
+
+        min_qty = min_notional = None
+        for f in info.get('filters', []):
+            filter_type = f.get('filterType')
+            if filter_type == 'LOT_SIZE':
+                min_qty = float(f.get('minQty', 0))
+            elif filter_type in ('MIN_NOTIONAL', 'NOTIONAL'):
+                min_notional = float(f.get('notional', f.get('minNotional', 0)))
+
+        result = (min_qty, min_notional)
+        self._limits_cache[symbol] = (self._symbol_info_bucket, result)
+        return result
     
     def set_leverage(self, symbol, level):
         """Set leverage with validation"""
@@ -208,8 +450,27 @@ class BinanceClient:
             notifier.notify_error(error_msg, "Order placement")
             return None
     
+    def place_batch_orders(self, orders):
+        """Place up to 5 orders in one signed batchOrders request.
+
+        Returns the per-order response list; rejected entries carry a
+        code/msg pair instead of an orderId.
+        """
+        self.rate_limit_check('place_order')
+        try:
+            # new_batch_order takes no recvWindow kwarg, unlike the
+            # single-order endpoints
+            response = self.client.new_batch_order(batchOrders=orders)
+            logging.info(f"Batch orders placed: {response}")
+            return response
+        except ClientError as error:
+            error_msg = f"Batch order error: {error.status_code}, {error.error_code}, {error.error_message}"
+            logging.error(error_msg)
+            notifier.notify_error(error_msg, "Batch order placement")
+            return None
+
     def get_positions(self):
-        """Get open positions with validation"""
+        """Get symbols with open positions as a set for O(1) membership tests"""
         self.rate_limit_check('get_positions')
         try:
             resp = self.client.get_position_risk()
@@ -219,28 +480,31 @@ class BinanceClient:
             
             if not resp:
                 logging.warning("Empty position response")
-                return []
-            
+                return set()
+
             if not isinstance(resp, list):
                 logging.error(f"Unexpected position response format: {type(resp)}")
-                return []
-                
-            positions = []
+                return set()
+
+            # Cheap string test first: most of the ~400 entries are flat, so
+            # skip the float() parse for anything that is literally zero.
+            # Malformed entries are skipped individually — failing the
+            # whole response would read as "no positions" upstream and
+            # trigger the orphaned-order cleanup on live positions
+            positions = set()
             for elem in resp:
-                try:
-                    position_amt = float(elem.get('positionAmt', 0))
-                    if abs(position_amt) > 0:
-                        symbol = elem.get('symbol', '')
-                        if self.validate_symbol(symbol):
-                            positions.append(symbol)
-                except (ValueError, TypeError) as e:
-                    logging.warning(f"Error parsing position data: {e}, elem: {elem}")
+                amt = elem.get('positionAmt', '0')
+                if amt in ('0', '0.0', '') or not elem.get('symbol', '').endswith('USDT'):
                     continue
-                    
+                try:
+                    if float(amt) != 0:
+                        positions.add(elem['symbol'])
+                except (TypeError, ValueError):
+                    logging.warning(f"Skipping malformed position entry: {elem}")
             return positions
         except Exception as error:
             logging.error(f"Position error: {str(error)}")
-            return []
+            return set()
     
     def get_open_orders(self, symbol=None):
         """Get open orders with validation - can get for specific symbol or all symbols"""
@@ -4,6 +4,15 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Valid Binance intervals (built once at module scope)
+VALID_INTERVALS = ['1s', '1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M']
+
+_INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000}
+
+def interval_seconds(interval: str) -> int:
+    """Seconds covered by one kline of the given Binance interval"""
+    return int(interval[:-1]) * _INTERVAL_UNITS[interval[-1]]
+
 class TradingConfig:
     """Centralized configuration for trading strategies"""
     
@@ -38,7 +47,17 @@ class TradingConfig:
     MAX_POSITIONS = max(1, min(50, int(os.getenv('MAX_POSITIONS', '5'))))
     KLINE_INTERVAL = os.getenv('KLINE_INTERVAL', '15m')
     BINANCE_FEE =  float(os.getenv('BINANCE_FEE', 0.0005))  # 0.05% maker/taker fee on futures, x2 for open/close
-    
+
+    # Derived once at import: TP must clear the SL distance plus round-trip
+    # fees and a minimum profit margin
+    EFFECTIVE_TAKE_PROFIT = max(TAKE_PROFIT, STOP_LOSS + BINANCE_FEE + 0.001)
+    # Per-side (stop, take-profit) price multipliers, derived once from
+    # config instead of being recomputed on every order
+    PRICE_MULT = {
+        'buy': (1 - STOP_LOSS, 1 + EFFECTIVE_TAKE_PROFIT),
+        'sell': (1 + STOP_LOSS, 1 - EFFECTIVE_TAKE_PROFIT),
+    }
+
     # Technical Indicators Parameters
     RSI_PERIOD = int(os.getenv('RSI_PERIOD', '14'))
     RSI_OVERSOLD = float(os.getenv('RSI_OVERSOLD', '30'))
@@ -66,7 +85,6 @@ class TradingConfig:
     TIMEZONE = os.getenv('TIMEZONE', 'UTC')  # Default to UTC, can be set to 'UTC+3' or similar
     
     # Security Settings
-    MIN_API_INTERVAL = 0.1
     MAX_CONSECUTIVE_ERRORS = 10
     MIN_BALANCE = 10.0
     
@@ -74,15 +92,18 @@ class TradingConfig:
     DEBUG_MODE = os.getenv('DEBUG_MODE', 'true').lower() == 'true'
     FORCE_TRADES = os.getenv('FORCE_TRADES', 'false').lower() == 'true'
     
+    # Sentinel so repeated validate_config calls are free after the first
+    _validated = False
+
     @classmethod
     def validate_config(cls) -> bool:
-        """Validate configuration parameters"""
+        """Validate configuration parameters (runs once per process)"""
+        if cls._validated:
+            return True
+
         if not cls.API_KEY or not cls.SECRET_KEY:
             raise ValueError("API credentials not found. Set BINANCE_API_KEY and BINANCE_SECRET_KEY environment variables")
-        
-        # Valid Binance intervals
-        valid_intervals = ['1s', '1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M']
-        
+
         validations = [
             (0 < cls.MIN_SIGNAL_STRENGTH <= 5, "MIN_SIGNAL_STRENGTH must be between 1 and 5"),
             (0 < cls.MIN_BACKTEST_SCORE <= 100, "MIN_BACKTEST_SCORE must be between 0 and 100"),
@@ -90,13 +111,14 @@ class TradingConfig:
             (0 < cls.VOLUME_THRESHOLD <= 10, "VOLUME_THRESHOLD must be between 0 and 10"),
             (0 < cls.STOP_LOSS < 0.1, "STOP_LOSS must be between 0 and 0.1"),
             (0 < cls.TAKE_PROFIT < 0.2, "TAKE_PROFIT must be between 0 and 0.2"),
-            (cls.KLINE_INTERVAL in valid_intervals, f"KLINE_INTERVAL must be one of: {', '.join(valid_intervals)}")
+            (cls.KLINE_INTERVAL in VALID_INTERVALS, f"KLINE_INTERVAL must be one of: {', '.join(VALID_INTERVALS)}")
         ]
-        
+
         for condition, message in validations:
             if not condition:
                 raise ValueError(f"Configuration error: {message}")
-        
+
+        cls._validated = True
         return True
 
 # Strategy configuration
@@ -0,0 +1,134 @@
+"""Numba-JIT indicator kernels.
+
+The EMA/RSI/MACD recurrences cannot be vectorized losslessly in NumPy;
+with numba installed they compile to tight native loops, and the batch
+variants fan out over all symbols in parallel. Without numba the module
+still imports and the kernels run as plain Python — callers should
+check NUMBA_AVAILABLE and prefer their NumPy paths in that case.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op decorator so the kernels stay importable without numba"""
+        if args and callable(args[0]):
+            return args[0]
+        def wrap(func):
+            return func
+        return wrap
+
+@njit(cache=True, fastmath=True)
+def ema(close, period):
+    """Exponential moving average over a float64 series"""
+    out = np.empty_like(close)
+    k = 2.0 / (period + 1)
+    out[0] = close[0]
+    for i in range(1, close.shape[0]):
+        out[i] = close[i] * k + out[i - 1] * (1.0 - k)
+    return out
+
+@njit(cache=True, fastmath=True)
+def rsi(close, period):
+    """Wilder RSI over a float64 series"""
+    n = close.shape[0]
+    out = np.full(n, 50.0)
+    if n <= period:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period, n):
+        if i > period:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        else:
+            out[i] = 100.0
+    return out
+
+@njit(cache=True, fastmath=True)
+def macd(close, fast, slow, signal):
+    """MACD line, signal line and histogram for a float64 series"""
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+@njit(cache=True, fastmath=True)
+def stoch_k(high, low, close, period, smooth):
+    """Smoothed stochastic %K for float64 OHLC series"""
+    n = close.shape[0]
+    raw = np.full(n, 50.0)
+    for i in range(period - 1, n):
+        hh = high[i]
+        ll = low[i]
+        for j in range(i - period + 1, i):
+            if high[j] > hh:
+                hh = high[j]
+            if low[j] < ll:
+                ll = low[j]
+        rng = hh - ll
+        if rng > 0:
+            raw[i] = (close[i] - ll) / rng * 100.0
+
+    out = np.full(n, 50.0)
+    for i in range(period + smooth - 2, n):
+        acc = 0.0
+        for j in range(i - smooth + 1, i + 1):
+            acc += raw[j]
+        out[i] = acc / smooth
+    return out
+
+@njit(cache=True, fastmath=True, parallel=True)
+def rsi_last_batch(closes, period):
+    """Last Wilder RSI value per row of a (n_symbols, n_bars) matrix"""
+    n = closes.shape[0]
+    out = np.empty(n)
+    for s in prange(n):
+        series = rsi(closes[s], period)
+        out[s] = series[-1]
+    return out
+
+@njit(cache=True, fastmath=True)
+def simulate_trades(close, signals, tp, sl, start):
+    """Per-trade PnL array for a signal series with TP/SL and flip exits.
+
+    `close` is float64, `signals` int8 (1=buy, -1=sell, 0=none); bars
+    before `start` are warm-up and never trade.
+    """
+    n = close.shape[0]
+    pnls = np.empty(n)
+    k = 0
+    pos = 0
+    entry = 0.0
+    for i in range(start, n - 1):
+        s = signals[i]
+        p = close[i]
+        if pos == 0 and s != 0:
+            pos = s
+            entry = p
+        elif pos != 0:
+            r = pos * (p - entry) / entry
+            if r >= tp or r <= -sl or s != pos:
+                pnls[k] = r
+                k += 1
+                pos = 0
+    return pnls[:k]
@@ -1,7 +1,11 @@
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from config import TradingConfig
 from binance_client import binance_client
+from async_client import fetch_klines_sync
+from market_stream import market_stream
 from notifications import notifier
 from strategies import strategy_engine
 from trading_manager import trading_manager
@@ -24,6 +28,7 @@ def main():
     if not binance_client.validate_connection():
         logging.error("Connection validation failed. Exiting.")
         notifier.notify_error("Connection validation failed", "Startup")
+        notifier.close()
         return
     
     # Get symbols
@@ -31,9 +36,14 @@ def main():
     if not symbols:
         logging.error("No symbols retrieved. Exiting.")
         notifier.notify_error("No symbols retrieved", "Startup")
+        notifier.close()
         return
     
     logging.info("Trading bot started with enhanced multi-strategy system")
+
+    # Stream klines for the scanned symbols so cycles trigger on bar close
+    # instead of a blind timer; REST polling stays as the fallback
+    market_stream.start(symbols[:50], TradingConfig.KLINE_INTERVAL)
     
     # Send startup notification
     if TradingConfig.NOTIFY_ON_STARTUP:
@@ -42,10 +52,13 @@ def main():
     
     while True:
         try:
-            # Check balance
+            # Served from the hourly volume-ranked cache, so this is a dict
+            # read on most cycles and a refresh when the ranking expires
+            symbols = binance_client.get_tickers_usdt() or symbols
+
+            # Check balance (pacing is handled by the client's token bucket)
             balance = binance_client.get_balance_usdt()
-            sleep(1)
-            
+
             if balance is None:
                 consecutive_errors += 1
                 logging.warning(f'Connection issue. Error count: {consecutive_errors}')
@@ -82,21 +95,22 @@ def main():
                             symb = order['symbol']
                             binance_client.cancel_order(symb,order['orderId'])
                             logging.info(f"Cancelled orphaned order {order['orderId']} for {symb}")
-                        sleep(0.5)
                 except Exception as e:
                     logging.warning(f"Error cleaning up orders: {str(e)}")
             
-            # Get open orders only for symbols that have positions
+            # One bulk openOrders call grouped client-side instead of a
+            # round-trip per position
             open_orders = {}
-            for symbol in positions:
+            if positions:
                 try:
-                    orders = binance_client.get_open_orders(symbol)
-                    if orders:
-                        open_orders[symbol] = orders
+                    grouped = defaultdict(list)
+                    for order in binance_client.get_open_orders():
+                        grouped[order.get('symbol', '')].append(order)
+                    open_orders = {s: grouped[s] for s in positions if s in grouped}
                 except Exception as e:
-                    logging.warning(f"Error getting open orders for {symbol}: {str(e)}")
+                    logging.warning(f"Error getting open orders: {str(e)}")
             
-            logging.info(f'Open positions ({len(positions)}): {positions}')
+            logging.info(f'Open positions ({len(positions)}): {sorted(positions)}')
             
             # Note: We can't clean up orphaned orders since we can't get all orders without symbols
             # This is a Binance API limitation
@@ -104,13 +118,59 @@ def main():
             # Look for new trading opportunities
             if len(positions) < min(TradingConfig.MAX_POSITIONS, 10):
                 signals_found = 0
-                
-                for symbol in symbols[:50]:  # Limit symbol processing
+
+                # Serve klines from the stream cache where it is warm, and
+                # concurrently REST-fetch only the symbols it cannot cover
+                # (one RTT instead of one blocking round-trip per symbol)
+                scan_symbols = [s for s in symbols[:50]
+                               if s not in positions and s not in open_orders]
+                klines_map = {}
+                missing = []
+                for symbol in scan_symbols:
+                    frame = market_stream.get_frame(symbol) if market_stream.active else None
+                    if frame is not None:
+                        klines_map[symbol] = frame
+                    else:
+                        missing.append(symbol)
+                if missing:
+                    try:
+                        fetched = fetch_klines_sync(missing, TradingConfig.KLINE_INTERVAL)
+                        klines_map.update(fetched)
+                        # Seed the stream windows so later cycles skip REST
+                        for symbol, frame in fetched.items():
+                            market_stream.seed(symbol, frame)
+                    except Exception as e:
+                        logging.warning(f"Concurrent kline fetch failed, falling back to per-symbol: {str(e)}")
+
+                # Vectorized pre-screen: cheap indicator gates over all
+                # symbols at once, full scoring only on the survivors
+                if klines_map:
+                    candidates = strategy_engine.scan_symbols_batch(klines_map)
+                    logging.info(f'Batch pre-screen: {len(candidates)}/{len(klines_map)} symbols pass')
+                else:
+                    candidates = scan_symbols
+
+                # Evaluate signals concurrently (the backtest-validated path
+                # does its own REST calls); order placement stays serial
+                signal_results = {}
+                if candidates:
+                    with ThreadPoolExecutor(max_workers=8) as executor:
+                        futures = {s: executor.submit(strategy_engine.get_best_strategy_signal,
+                                                      s, klines_map.get(s))
+                                   for s in candidates}
+                        for s, future in futures.items():
+                            try:
+                                signal_results[s] = future.result()
+                            except Exception as e:
+                                logging.error(f"Error evaluating {s}: {str(e)}")
+
+                for symbol in candidates:
                     if len(positions) >= TradingConfig.MAX_POSITIONS:
                         break
                     try:
-                        # Get enhanced signal
-                        signal_data = strategy_engine.get_best_strategy_signal(symbol)
+                        signal_data = signal_results.get(symbol)
+                        if not signal_data:
+                            continue
                         signal = signal_data.get('signal')
                         strength = signal_data.get('strength', 0)
                         
@@ -146,23 +206,14 @@ def main():
                             )
                             
                             # Set leverage and margin type
-                            if (binance_client.set_margin_type(symbol, TradingConfig.MARGIN_TYPE) and 
+                            if (binance_client.set_margin_type(symbol, TradingConfig.MARGIN_TYPE) and
                                 binance_client.set_leverage(symbol, TradingConfig.LEVERAGE)):
-                                sleep(1)
-                                
                                 # Place order
-                                if trading_manager.open_order(symbol, signal):
-                                    trading_manager.last_symbol = symbol
-                                    positions = binance_client.get_positions()
-                                    # Update open_orders after placing new order
-                                    if symbol in positions:
-                                        try:
-                                            orders = binance_client.get_open_orders(symbol)
-                                            if orders:
-                                                open_orders[symbol] = orders
-                                        except:
-                                            pass
-                                    sleep(10)  # Cool down
+                                if trading_manager.open_order(symbol, signal, balance):
+                                    # Track the new position locally; the next
+                                    # cycle refreshes positions and orders from
+                                    # the API anyway, so no refetch here
+                                    positions.add(symbol)
                                     break  # Only one order per cycle
                     
                     except Exception as e:
@@ -172,8 +223,12 @@ def main():
                 
                 logging.info(f'Signals found in this cycle: {signals_found}')
             
-            logging.info('Cycle completed. Waiting 3 minutes...')
-            sleep(180)
+            if market_stream.active:
+                logging.info('Cycle completed. Waiting for next bar close...')
+                market_stream.wait_for_bar_close(180)
+            else:
+                logging.info('Cycle completed. Waiting 3 minutes...')
+                sleep(180)
             
         except KeyboardInterrupt:
             logging.info("Bot stopped by user")
@@ -190,8 +245,10 @@ def main():
                 break
             sleep(60)
     
+    market_stream.stop()
     logging.info("Trading bot stopped")
     notifier.notify_bot_status("Stopped", "Normal shutdown")
+    notifier.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import orjson
+import pandas as pd
+from config import TradingConfig, interval_seconds
+
+try:
+    from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+# Seconds without any stream message before the socket is presumed dead;
+# kline continuation ticks normally arrive every few hundred ms
+STALL_TIMEOUT = 90
+
+class MarketStream:
+    """Kline WebSocket cache that drives the scan cycle.
+
+    Subscribes to the kline stream for the scanned symbols and keeps a
+    rolling window of closed candles per symbol. A bar-close event wakes
+    the main loop the moment fresh data exists instead of a blind sleep,
+    and the latest tick doubles as a local price cache. REST polling
+    remains the fallback whenever the stream is not running.
+    """
+
+    def __init__(self, maxlen=200):
+        self.maxlen = maxlen
+        self._interval_ms = interval_seconds(TradingConfig.KLINE_INTERVAL) * 1000
+        self.klines = {}      # symbol -> deque of [ts, open, high, low, close, volume]
+        self.last_price = {}  # symbol -> most recent streamed close
+        self._price_ts = {}   # symbol -> monotonic time of that price
+        self.bar_closed = threading.Event()
+        self._client = None
+        self._lock = threading.Lock()
+        self._symbols = []
+        self._interval = None
+        self._started_at = None
+        self._last_event = None
+
+    @property
+    def active(self):
+        """Whether the stream is connected and recently delivered data.
+
+        A silently dropped socket keeps the client object alive but stops
+        all messages; after STALL_TIMEOUT without one, tear the stream
+        down and resubscribe, reporting inactive for this cycle so
+        callers fall back to REST in the meantime.
+        """
+        if self._client is None:
+            return False
+        last = self._last_event or self._started_at or 0
+        if time.monotonic() - last > STALL_TIMEOUT:
+            logging.warning("Market stream stalled; reconnecting")
+            self.stop()
+            if self._symbols:
+                self.start(self._symbols, self._interval)
+            return False
+        return True
+
+    def start(self, symbols, interval=None):
+        """Subscribe to kline streams for the given symbols"""
+        if not WEBSOCKET_AVAILABLE:
+            logging.warning("WebSocket client unavailable; staying on REST polling")
+            return False
+
+        interval = interval or TradingConfig.KLINE_INTERVAL
+        self._interval_ms = interval_seconds(interval) * 1000
+        self._symbols = list(symbols)
+        self._interval = interval
+        self._started_at = time.monotonic()
+        self._last_event = None
+        try:
+            self._client = UMFuturesWebsocketClient(on_message=self._on_message)
+            for symbol in symbols:
+                self._client.kline(symbol=symbol.lower(), interval=interval)
+            logging.info(f"Market stream started for {len(symbols)} symbols")
+            return True
+        except Exception as e:
+            logging.error(f"Failed to start market stream: {str(e)}")
+            self._client = None
+            return False
+
+    def stop(self):
+        """Tear down the stream connection"""
+        if self._client is not None:
+            try:
+                self._client.stop()
+            except Exception as e:
+                logging.warning(f"Error stopping market stream: {str(e)}")
+            self._client = None
+
+    def _on_message(self, _, message):
+        """Handle one stream payload: update price cache and kline window"""
+        try:
+            self._last_event = time.monotonic()
+            data = orjson.loads(message) if isinstance(message, (str, bytes)) else message
+            k = data.get('k')
+            if not k:
+                return
+
+            symbol = data.get('s', '')
+            self.last_price[symbol] = float(k['c'])
+            self._price_ts[symbol] = time.monotonic()
+
+            if k.get('x'):  # candle just closed
+                with self._lock:
+                    window = self.klines.setdefault(symbol, deque(maxlen=self.maxlen))
+                    window.append([int(k['t']), float(k['o']), float(k['h']),
+                                   float(k['l']), float(k['c']), float(k['v'])])
+                self.bar_closed.set()
+        except Exception as e:
+            logging.warning(f"Error handling stream message: {str(e)}")
+
+    def wait_for_bar_close(self, timeout):
+        """Block until any subscribed symbol closes a candle, or timeout"""
+        fired = self.bar_closed.wait(timeout)
+        self.bar_closed.clear()
+        return fired
+
+    def _window_stale(self, window):
+        """Whether a kline window has stopped receiving bar closes.
+
+        The last closed bar's open time should never trail now by more
+        than two intervals on a live feed; beyond that the window is a
+        frozen snapshot (unsubscribed symbol, dropped socket) and must
+        not feed signals.
+        """
+        return time.time() * 1000 - window[-1][0] > 2 * self._interval_ms
+
+    def get_price(self, symbol, max_age=None):
+        """Latest streamed price for symbol, or None if not cached yet.
+
+        With `max_age` set, a price older than that many seconds is
+        treated as missing so callers fall back to REST instead of
+        trading on a stalled stream.
+        """
+        price = self.last_price.get(symbol)
+        if price is None:
+            return None
+        if max_age is not None:
+            ts = self._price_ts.get(symbol)
+            if ts is None or time.monotonic() - ts > max_age:
+                return None
+        return price
+
+    def seed(self, symbol, frame):
+        """Backfill the kline window from a REST-fetched OHLCV frame.
+
+        The last REST row is the in-progress candle and is dropped so the
+        stream's closed-candle appends line up without duplicates. A window
+        already fed by the stream is never clobbered.
+        """
+        if frame is None or len(frame) < 2:
+            return
+        with self._lock:
+            existing = self.klines.get(symbol)
+            if existing and not self._window_stale(existing):
+                return
+            window = deque(maxlen=self.maxlen)
+            ts = frame.index.values.astype('datetime64[ms]').astype('int64')
+            for t, row in zip(ts[:-1], frame.values[:-1]):
+                window.append([int(t), row[0], row[1], row[2], row[3], row[4]])
+            self.klines[symbol] = window
+
+    def get_frame(self, symbol, min_bars=50):
+        """Build an OHLCV DataFrame from the cached window, or None if cold"""
+        with self._lock:
+            window = self.klines.get(symbol)
+            if not window or len(window) < min_bars or self._window_stale(window):
+                return None
+            arr = np.array(window, dtype=np.float64)
+
+        ts = arr[:, 0].astype(np.int64)
+        index = pd.DatetimeIndex(ts.view('datetime64[ms]'), name='Time')
+        return pd.DataFrame({
+            'Open': arr[:, 1],
+            'High': arr[:, 2],
+            'Low': arr[:, 3],
+            'Close': arr[:, 4],
+            'Volume': arr[:, 5],
+        }, index=index)
+
+# Global market stream instance
+market_stream = MarketStream()
@@ -1,47 +1,94 @@
 import logging
+import queue
+import threading
+import time
 import apprise
 from datetime import datetime,timezone,timedelta
 from config import TradingConfig
 
+# Title prefix per notification type, built once
+TYPE_EMOJI = {
+    'success': '✅',
+    'warning': '⚠️',
+    'error': '❌',
+    'trade': '💰',
+    'info': 'ℹ️',
+}
+
 class NotificationManager:
     """Handle all notifications for the trading bot"""
     
     def __init__(self):
         self.apobj = apprise.Apprise()
-        
+
         # Add notification services
         for service in TradingConfig.NOTIFICATION_SERVICES:
             if service.strip():
                 self.apobj.add(service.strip())
-    
+
+        self.enabled = bool(TradingConfig.NOTIFICATION_SERVICES)
+
+        # Timezone is static config; build the tzinfo object once instead
+        # of re-parsing the TIMEZONE string on every notification
+        if TradingConfig.TIMEZONE == 'UTC':
+            self.tz = timezone.utc
+        else:
+            try:
+                self.tz = timezone(timedelta(hours=int(TradingConfig.TIMEZONE.replace('UTC', ''))))
+            except ValueError:
+                logging.warning(f"Invalid TIMEZONE '{TradingConfig.TIMEZONE}', falling back to UTC")
+                self.tz = timezone.utc
+
+        # Deliveries are HTTP posts to external services; drain them on a
+        # daemon thread so callers (the order path included) never block
+        # on a notification round-trip
+        self._queue = queue.Queue()
+        if self.enabled:
+            threading.Thread(target=self._drain, daemon=True).start()
+
+    def close(self, timeout=5.0):
+        """Wait briefly for queued notifications to be delivered.
+
+        The delivery thread is a daemon, so anything still queued when
+        the process exits would be lost — including the final shutdown
+        status. Call this after the main loop ends.
+        """
+        if not self.enabled:
+            return
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def _drain(self):
+        """Deliver queued notifications in the background"""
+        while True:
+            title, body = self._queue.get()
+            try:
+                self.apobj.notify(title=title, body=body)
+                logging.info(f"Notification sent: {title}")
+            except Exception as e:
+                logging.error(f"Failed to send notification: {str(e)}")
+            finally:
+                self._queue.task_done()
+
     def send_notification(self, title, message, notification_type='info'):
-        """Send notification using Apprise with different types"""
-        if not TradingConfig.NOTIFICATION_SERVICES:
+        """Queue a notification for background delivery"""
+        if not self.enabled:
             return
-            
+
         try:
-            # Add emoji and formatting based on type
-            if notification_type == 'success':
-                title = f"✅ {title}"
-            elif notification_type == 'warning':
-                title = f"⚠️ {title}"
-            elif notification_type == 'error':
-                title = f"❌ {title}"
-            elif notification_type == 'trade':
-                title = f"💰 {title}"
-            elif notification_type == 'info':
-                title = f"ℹ️ {title}"
-                
+            # Add emoji prefix based on type
+            emoji = TYPE_EMOJI.get(notification_type)
+            if emoji:
+                title = f"{emoji} {title}"
+
             # Format message with timestamp
-            tz = timezone.utc if TradingConfig.TIMEZONE == 'UTC' else timezone(timedelta(hours=int(TradingConfig.TIMEZONE.replace('UTC',''))))
-            formatted_message = f"{message}\n\n🕐 {datetime.now(tz=tz).strftime('%Y-%m-%d %H:%M:%S')}"
+            formatted_message = f"{message}\n\n🕐 {datetime.now(tz=self.tz).strftime('%Y-%m-%d %H:%M:%S')}"
             
-            # Send notification
-            self.apobj.notify(title=title, body=formatted_message)
-            logging.info(f"Notification sent: {title}")
+            self._queue.put((title, formatted_message))
             
         except Exception as e:
-            logging.error(f"Failed to send notification: {str(e)}")
+            logging.error(f"Failed to queue notification: {str(e)}")
     
     def notify_trade_signal(self, symbol, side, signal_type, price=None, strategy_info=None):
         """Send notification for trading signals"""
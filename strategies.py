@@ -1,12 +1,75 @@
 import logging
+import time
 import pandas as pd
 import numpy as np
 import ta
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from config import TradingConfig, STRATEGY_CONFIG
-from binance_client import binance_client
+from config import TradingConfig, STRATEGY_CONFIG, interval_seconds
+from binance_client import binance_client, klines_to_dataframe
+import indicators_nb
+
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+def rsi_series(close: pd.Series, period: int = 14) -> pd.Series:
+    """RSI via C-compiled TA-Lib when available, else the ta fallback"""
+    if TALIB_AVAILABLE:
+        return pd.Series(talib.RSI(close.values, timeperiod=period), index=close.index)
+    return ta.momentum.RSIIndicator(close, window=period).rsi()
+
+def ema_series(close: pd.Series, period: int) -> pd.Series:
+    """EMA via C-compiled TA-Lib when available, else the ta fallback"""
+    if TALIB_AVAILABLE:
+        return pd.Series(talib.EMA(close.values, timeperiod=period), index=close.index)
+    return ta.trend.ema_indicator(close, window=period)
+
+def macd_series(close: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """(MACD line, signal line, histogram) via TA-Lib or the ta fallback"""
+    if TALIB_AVAILABLE:
+        macd_line, signal_line, hist = talib.MACD(close.values)
+        idx = close.index
+        return pd.Series(macd_line, index=idx), pd.Series(signal_line, index=idx), pd.Series(hist, index=idx)
+    return ta.trend.macd(close), ta.trend.macd_signal(close), ta.trend.macd_diff(close)
+
+def stoch_series(high: pd.Series, low: pd.Series, close: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """(%K, %D) via TA-Lib or the ta fallback"""
+    if TALIB_AVAILABLE:
+        k, d = talib.STOCH(high.values, low.values, close.values,
+                           fastk_period=14, slowk_period=3, slowd_period=3)
+        return pd.Series(k, index=close.index), pd.Series(d, index=close.index)
+    return (ta.momentum.stoch(high, low, close),
+            ta.momentum.stoch_signal(high, low, close))
+
+@dataclass
+class IndicatorBundle:
+    """Per-symbol indicator set computed once and shared by all strategies"""
+    rsi: pd.Series
+    bb_upper: pd.Series
+    bb_middle: pd.Series
+    bb_lower: pd.Series
+    vwap: pd.Series
+    ema50: pd.Series
+    ema100: pd.Series
+    ema200: pd.Series
+    macd_line: pd.Series
+    macd_signal: pd.Series
+    macd_diff: pd.Series
+    stoch_k: pd.Series
+    stoch_d: pd.Series
+    volume_profile: Dict[str, float]
 
 @dataclass
 class BacktestResult:
@@ -22,14 +85,88 @@ class BacktestResult:
     sharpe_ratio: float
     score: float
 
+class IncrementalRSI:
+    """O(1) Wilder RSI updates keyed by symbol.
+
+    The scan recomputed the full 200-bar recurrence every cycle even
+    though at most one closed candle arrives between cycles. Cache the
+    Wilder smoothing state per symbol and fold in only the bars newer
+    than the cached timestamp, rebuilding from scratch on gaps.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._interval_ms = interval_seconds(TradingConfig.KLINE_INTERVAL) * 1000
+        self._state = {}  # symbol -> (last_ts, last_close, avg_gain, avg_loss)
+
+    def update(self, symbol: str, kl: pd.DataFrame) -> float:
+        """Return the latest RSI for the symbol's OHLCV frame"""
+        period = self.period
+        closes = kl.Close.values
+        ts = kl.index.values.astype('datetime64[ms]').astype('int64')
+
+        # REST frames end with the in-progress candle, whose close is
+        # provisional; folding it in would bake a mid-bar price into the
+        # smoothing state forever. Keep only bars whose close time is
+        # already past, the same row market_stream.seed drops.
+        closed = int(np.searchsorted(ts + self._interval_ms, time.time() * 1000, side='right'))
+        if closed < len(ts):
+            closes = closes[:closed]
+            ts = ts[:closed]
+        if closed <= period:
+            return 50.0
+
+        state = self._state.get(symbol)
+        if state is not None:
+            last_ts, last_close, avg_gain, avg_loss = state
+            start = int(np.searchsorted(ts, last_ts, side='right'))
+            # Rebuild on gaps (restart, eviction) instead of drifting
+            if 0 < start and len(ts) - start <= period:
+                for i in range(start, len(ts)):
+                    delta = closes[i] - last_close
+                    gain = delta if delta > 0 else 0.0
+                    loss = -delta if delta < 0 else 0.0
+                    avg_gain = (avg_gain * (period - 1) + gain) / period
+                    avg_loss = (avg_loss * (period - 1) + loss) / period
+                    last_close = closes[i]
+                    last_ts = ts[i]
+                self._state[symbol] = (last_ts, last_close, avg_gain, avg_loss)
+                return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss) if avg_loss > 0 else 100.0
+
+        # Cold start: run the full recurrence once and keep its state
+        deltas = np.diff(closes)
+        gains = np.clip(deltas, 0, None)
+        losses = np.clip(-deltas, 0, None)
+        avg_gain = gains[:period].mean()
+        avg_loss = losses[:period].mean()
+        for i in range(period, len(deltas)):
+            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        self._state[symbol] = (ts[-1], closes[-1], avg_gain, avg_loss)
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss) if avg_loss > 0 else 100.0
+
 class AdvancedStrategy:
     """Advanced trading strategy with multiple indicators"""
-    
+
     def __init__(self):
         self.backtest_results = {}
+        self._rsi_cache = IncrementalRSI(TradingConfig.RSI_PERIOD)
+        self._kline_cache = {}  # (symbol, interval) -> (bucket, DataFrame)
         
     def calculate_bollinger_bands(self, df: pd.DataFrame, window: int = 20) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """Calculate Bollinger Bands"""
+        if TALIB_AVAILABLE:
+            upper, middle, lower = talib.BBANDS(df.Close.values, timeperiod=window)
+            idx = df.index
+            return pd.Series(upper, index=idx), pd.Series(middle, index=idx), pd.Series(lower, index=idx)
+        if BOTTLENECK_AVAILABLE:
+            close = df.Close.values
+            mean = bn.move_mean(close, window)
+            std = bn.move_std(close, window, ddof=0)
+            idx = df.index
+            return (pd.Series(mean + 2 * std, index=idx),
+                    pd.Series(mean, index=idx),
+                    pd.Series(mean - 2 * std, index=idx))
         bb_upper = ta.volatility.bollinger_hband(df.Close, window=window)
         bb_lower = ta.volatility.bollinger_lband(df.Close, window=window)
         bb_middle = ta.volatility.bollinger_mavg(df.Close, window=window)
@@ -41,8 +178,10 @@ class AdvancedStrategy:
     
     def calculate_fibonacci_levels(self, df: pd.DataFrame, period: int = 50) -> Dict[str, float]:
         """Calculate Fibonacci retracement levels"""
-        high = df.High.rolling(period).max().iloc[-1]
-        low = df.Low.rolling(period).min().iloc[-1]
+        # Only the last window matters; a full rolling max/min materializes
+        # an intermediate Series just to read its final element
+        high = df.High.values[-period:].max()
+        low = df.Low.values[-period:].min()
         diff = high - low
         
         levels = {
@@ -57,76 +196,231 @@ class AdvancedStrategy:
     
     def calculate_volume_profile(self, df: pd.DataFrame) -> Dict[str, float]:
         """Calculate volume analysis indicators"""
-        # Calculate volume moving average using pandas instead of ta.volume.volume_sma
-        volume_sma = df.Volume.rolling(window=20).mean()
-        volume_ratio = df.Volume.iloc[-1] / volume_sma.iloc[-1] if volume_sma.iloc[-1] > 0 else 1
+        # Only the last window's mean is ever read, so average the tail
+        # slice directly instead of materializing a full rolling series
+        volume = df.Volume.values
+        avg_volume = volume[-20:].mean()
+        volume_ratio = volume[-1] / avg_volume if avg_volume > 0 else 1
         
         return {
             'volume_ratio': volume_ratio,
-            'avg_volume': volume_sma.iloc[-1],
-            'current_volume': df.Volume.iloc[-1]
+            'avg_volume': avg_volume,
+            'current_volume': volume[-1]
         }
     
-    def rsi_bollinger_vwap_strategy(self, symbol: str) -> Dict[str, any]:
+    def _cached_klines(self, symbol: str, interval: str = None) -> Optional[pd.DataFrame]:
+        """Klines for the symbol, cached until the current bar closes.
+
+        The strategies and get_best_strategy_signal can each fetch the
+        same frame several times per cycle; within one bar interval those
+        fetches return identical data, so serve them from a dict keyed by
+        the bar bucket and refetch only after the bar rolls over.
+        """
+        interval = interval or TradingConfig.KLINE_INTERVAL
+        bucket = int(time.time()) // interval_seconds(interval)
+        key = (symbol, interval)
+        cached = self._kline_cache.get(key)
+        if cached is not None and cached[0] == bucket:
+            return cached[1]
+        kl = binance_client.get_klines(symbol, interval=interval)
+        if kl is not None:
+            self._kline_cache[key] = (bucket, kl)
+        return kl
+
+    def _compute_indicator_bundle(self, kl: pd.DataFrame) -> IndicatorBundle:
+        """Compute every indicator the strategies share in one pass.
+
+        get_best_strategy_signal runs up to three strategies per symbol;
+        building the bundle once removes the overlapping EMA/RSI/volume
+        recomputation each of them used to do.
+        """
+        bb_upper, bb_middle, bb_lower = self.calculate_bollinger_bands(kl)
+        macd_line, macd_signal, macd_diff = macd_series(kl.Close)
+        stoch_k, stoch_d = stoch_series(kl.High, kl.Low, kl.Close)
+        return IndicatorBundle(
+            rsi=rsi_series(kl.Close),
+            bb_upper=bb_upper,
+            bb_middle=bb_middle,
+            bb_lower=bb_lower,
+            vwap=self.calculate_vwap(kl),
+            ema50=ema_series(kl.Close, 50),
+            ema100=ema_series(kl.Close, 100),
+            ema200=ema_series(kl.Close, 200),
+            macd_line=macd_line,
+            macd_signal=macd_signal,
+            macd_diff=macd_diff,
+            stoch_k=stoch_k,
+            stoch_d=stoch_d,
+            volume_profile=self.calculate_volume_profile(kl),
+        )
+
+    def scan_symbols_batch(self, klines_map: Dict[str, pd.DataFrame]) -> List[str]:
+        """Vectorized pre-screen over all fetched symbols at once.
+
+        Stacks the OHLCV columns into (n_symbols, n_bars) matrices and
+        computes a cheap trigger gate per strategy — RSI/Bollinger
+        proximity, MACD and EMA50/200 sign flips, stochastic extremes —
+        as NumPy reductions over all symbols, returning only the symbols
+        worth running the full per-symbol strategy scoring on.
+        """
+        try:
+            symbols = [s for s, kl in klines_map.items() if kl is not None and len(kl) >= 50]
+            if not symbols:
+                return []
+
+            n_bars = min(len(klines_map[s]) for s in symbols)
+            closes = np.vstack([klines_map[s].Close.values[-n_bars:] for s in symbols])
+            volumes = np.vstack([klines_map[s].Volume.values[-n_bars:] for s in symbols])
+            highs = np.vstack([klines_map[s].High.values[-n_bars:] for s in symbols])
+            lows = np.vstack([klines_map[s].Low.values[-n_bars:] for s in symbols])
+
+            # Incremental Wilder RSI: cold symbols pay the full recurrence
+            # once, warm symbols fold in only the new bars
+            rsi = np.array([self._rsi_cache.update(s, klines_map[s]) for s in symbols])
+
+            # Bollinger distance and volume ratio from tail-window reductions
+            window = TradingConfig.BB_PERIOD
+            tail = closes[:, -window:]
+            bb_mid = tail.mean(axis=1)
+            bb_std = tail.std(axis=1)
+            bb_upper = bb_mid + TradingConfig.BB_STD * bb_std
+            bb_lower = bb_mid - TradingConfig.BB_STD * bb_std
+            last_close = closes[:, -1]
+
+            vol_sma = volumes[:, -window:].mean(axis=1)
+            vol_ratio = np.divide(volumes[:, -1], vol_sma, out=np.ones_like(vol_sma), where=vol_sma > 0)
+
+            # MACD histogram and EMA50/200 spread on the last two bars via
+            # columnwise EMA recurrences, vectorized across symbols — the
+            # triggers of the MACD strategy fire with mid-range RSI and
+            # price between the bands, so the RSI/BB gates cannot stand in
+            # for them
+            k12, k26, k9 = 2 / 13.0, 2 / 27.0, 2 / 10.0
+            k50, k200 = 2 / 51.0, 2 / 201.0
+            e12 = closes[:, 0].copy()
+            e26 = closes[:, 0].copy()
+            e50 = closes[:, 0].copy()
+            e200 = closes[:, 0].copy()
+            sig = np.zeros(len(symbols))
+            diff_prev = diff_last = spread_prev = spread_last = sig
+            for i in range(1, n_bars):
+                col = closes[:, i]
+                e12 += k12 * (col - e12)
+                e26 += k26 * (col - e26)
+                e50 += k50 * (col - e50)
+                e200 += k200 * (col - e200)
+                macd_line = e12 - e26
+                sig = macd_line.copy() if i == 1 else sig + k9 * (macd_line - sig)
+                if i == n_bars - 2:
+                    diff_prev = macd_line - sig
+                    spread_prev = e50 - e200
+                elif i == n_bars - 1:
+                    diff_last = macd_line - sig
+                    spread_last = e50 - e200
+
+            macd_gate = ((np.sign(diff_last) != np.sign(diff_prev)) |
+                         (np.sign(spread_last) != np.sign(spread_prev)))
+
+            # Raw stochastic position in the 14-bar range: a %K cross of
+            # 20/80 needs the close pinned near the window low/high
+            low14 = lows[:, -14:].min(axis=1)
+            high14 = highs[:, -14:].max(axis=1)
+            stoch_range = high14 - low14
+            stoch_raw = np.where(stoch_range > 0,
+                                 (last_close - low14) / np.where(stoch_range > 0, stoch_range, 1.0) * 100,
+                                 50.0)
+
+            rsi_bb_gate = (
+                (rsi <= TradingConfig.RSI_OVERSOLD + 5) |
+                (rsi >= TradingConfig.RSI_OVERBOUGHT - 5) |
+                (last_close <= bb_lower * 1.01) |
+                (last_close >= bb_upper * 0.99)
+            )
+            stoch_gate = (stoch_raw <= 25) | (stoch_raw >= 75)
+
+            # RSI/BB and MACD strategies both reject low volume in full
+            # scoring, so their gates carry a half-threshold floor; the
+            # stochastic strategy takes no volume condition and stays
+            # ungated to keep its signal set unchanged
+            vol_ok = vol_ratio >= STRATEGY_CONFIG['volume_threshold'] * 0.5
+            interesting = ((rsi_bb_gate | macd_gate) & vol_ok) | stoch_gate
+
+            return [s for s, keep in zip(symbols, interesting) if keep]
+
+        except Exception as e:
+            logging.error(f"Error in batch symbol scan: {str(e)}")
+            return list(klines_map.keys())
+
+    def rsi_bollinger_vwap_strategy(self, symbol: str, kl: Optional[pd.DataFrame] = None,
+                                    bundle: Optional[IndicatorBundle] = None) -> Dict[str, any]:
         """Enhanced RSI + Bollinger Bands + VWAP strategy"""
         try:
-            kl = binance_client.get_klines(symbol, interval=TradingConfig.KLINE_INTERVAL)
+            if kl is None:
+                kl = self._cached_klines(symbol)
             if kl is None or len(kl) < 50:
                 return {'signal': 'none', 'strength': 0, 'reasons': []}
-            
-            # Technical indicators
-            rsi = ta.momentum.RSIIndicator(kl.Close).rsi()
-            bb_upper, bb_middle, bb_lower = self.calculate_bollinger_bands(kl)
-            vwap = self.calculate_vwap(kl)
-            ema200 = ta.trend.ema_indicator(kl.Close, window=200)
-            volume_profile = self.calculate_volume_profile(kl)
-            
-            current_price = kl.Close.iloc[-1]
+
+            # Volume gate first: a failing ratio rejects the signal at the
+            # end regardless, so skip the indicator work entirely
+            volume_profile = (bundle.volume_profile if bundle is not None
+                              else self.calculate_volume_profile(kl))
+            if volume_profile['volume_ratio'] < STRATEGY_CONFIG['volume_threshold']:
+                return {'signal': 'none', 'strength': 0,
+                        'reasons': [f"Low volume: {volume_profile['volume_ratio']:.2f}"]}
+
+            if bundle is None:
+                bundle = self._compute_indicator_bundle(kl)
+
+            # Raw arrays for the scalar lookups below; repeated .iloc
+            # calls pay pandas label-resolution cost per access
+            rsi = bundle.rsi.values
+            bb_upper, bb_lower = bundle.bb_upper.values, bundle.bb_lower.values
+            vwap = bundle.vwap.values
+            ema200 = bundle.ema200.values
+            close = kl.Close.values
+
+            current_price = close[-1]
             signals = []
             reasons = []
             
             # RSI signals
-            if rsi.iloc[-1] < 30 and rsi.iloc[-2] >= 30:
+            if rsi[-1] < 30 and rsi[-2] >= 30:
                 signals.append('buy')
                 reasons.append('RSI oversold bounce')
-            elif rsi.iloc[-1] > 70 and rsi.iloc[-2] <= 70:
+            elif rsi[-1] > 70 and rsi[-2] <= 70:
                 signals.append('sell')
                 reasons.append('RSI overbought decline')
             
             # Bollinger Bands signals
-            if current_price <= bb_lower.iloc[-1] * 1.01:
+            if current_price <= bb_lower[-1] * 1.01:
                 signals.append('buy')
                 reasons.append('Price near BB lower band')
-            elif current_price >= bb_upper.iloc[-1] * 0.99:
+            elif current_price >= bb_upper[-1] * 0.99:
                 signals.append('sell')
                 reasons.append('Price near BB upper band')
             
             # VWAP signals
-            if current_price > vwap.iloc[-1] and kl.Close.iloc[-2] <= vwap.iloc[-2]:
+            if current_price > vwap[-1] and close[-2] <= vwap[-2]:
                 signals.append('buy')
                 reasons.append('Price crossed above VWAP')
-            elif current_price < vwap.iloc[-1] and kl.Close.iloc[-2] >= vwap.iloc[-2]:
+            elif current_price < vwap[-1] and close[-2] >= vwap[-2]:
                 signals.append('sell')
                 reasons.append('Price crossed below VWAP')
             
             # Trend filter
-            trend_bullish = current_price > ema200.iloc[-1]
+            trend_bullish = current_price > ema200[-1]
             if not trend_bullish and 'buy' in signals:
                 reasons.append('Trend filter: bearish trend')
             elif trend_bullish and 'sell' in signals:
                 reasons.append('Trend filter: bullish trend')
             
-            # Volume filter
-            if volume_profile['volume_ratio'] < STRATEGY_CONFIG['volume_threshold']:
-                reasons.append(f"Low volume: {volume_profile['volume_ratio']:.2f}")
-            
-            # Determine final signal
+            # Determine final signal (volume already gated above)
             buy_signals = signals.count('buy')
             sell_signals = signals.count('sell')
             
-            if buy_signals >= STRATEGY_CONFIG['min_signal_strength'] and trend_bullish and volume_profile['volume_ratio'] >= STRATEGY_CONFIG['volume_threshold']:
+            if buy_signals >= STRATEGY_CONFIG['min_signal_strength'] and trend_bullish:
                 return {'signal': 'buy', 'strength': buy_signals, 'reasons': reasons}
-            elif sell_signals >= STRATEGY_CONFIG['min_signal_strength'] and not trend_bullish and volume_profile['volume_ratio'] >= STRATEGY_CONFIG['volume_threshold']:
+            elif sell_signals >= STRATEGY_CONFIG['min_signal_strength'] and not trend_bullish:
                 return {'signal': 'sell', 'strength': sell_signals, 'reasons': reasons}
             else:
                 return {'signal': 'none', 'strength': max(buy_signals, sell_signals), 'reasons': reasons}
@@ -135,55 +429,62 @@ class AdvancedStrategy:
             logging.error(f"Error in RSI-BB-VWAP strategy for {symbol}: {str(e)}")
             return {'signal': 'none', 'strength': 0, 'reasons': [f'Error: {str(e)}']}
     
-    def macd_ema_volume_strategy(self, symbol: str) -> Dict[str, any]:
+    def macd_ema_volume_strategy(self, symbol: str, kl: Optional[pd.DataFrame] = None,
+                                 bundle: Optional[IndicatorBundle] = None) -> Dict[str, any]:
         """MACD + EMA + Volume strategy"""
         try:
-            kl = binance_client.get_klines(symbol, interval=TradingConfig.KLINE_INTERVAL)
+            if kl is None:
+                kl = self._cached_klines(symbol)
             if kl is None or len(kl) < 50:
                 return {'signal': 'none', 'strength': 0, 'reasons': []}
-            
-            # Technical indicators
-            macd_line = ta.trend.macd(kl.Close)
-            macd_signal = ta.trend.macd_signal(kl.Close)
-            macd_diff = ta.trend.macd_diff(kl.Close)
-            ema50 = ta.trend.ema_indicator(kl.Close, window=50)
-            ema200 = ta.trend.ema_indicator(kl.Close, window=200)
-            volume_profile = self.calculate_volume_profile(kl)
+
+            # Same cheap volume gate as the RSI strategy
+            volume_profile = (bundle.volume_profile if bundle is not None
+                              else self.calculate_volume_profile(kl))
+            if volume_profile['volume_ratio'] < STRATEGY_CONFIG['volume_threshold']:
+                return {'signal': 'none', 'strength': 0,
+                        'reasons': [f"Insufficient volume: {volume_profile['volume_ratio']:.2f}x"]}
+
+            if bundle is None:
+                bundle = self._compute_indicator_bundle(kl)
+
+            macd_line = bundle.macd_line.values
+            macd_signal = bundle.macd_signal.values
+            macd_diff = bundle.macd_diff.values
+            ema50 = bundle.ema50.values
+            ema200 = bundle.ema200.values
             
             signals = []
             reasons = []
             
             # MACD signals
-            if (macd_diff.iloc[-1] > 0 and macd_diff.iloc[-2] <= 0 and 
-                macd_line.iloc[-1] > macd_signal.iloc[-1]):
+            if (macd_diff[-1] > 0 and macd_diff[-2] <= 0 and 
+                macd_line[-1] > macd_signal[-1]):
                 signals.append('buy')
                 reasons.append('MACD bullish crossover')
-            elif (macd_diff.iloc[-1] < 0 and macd_diff.iloc[-2] >= 0 and 
-                  macd_line.iloc[-1] < macd_signal.iloc[-1]):
+            elif (macd_diff[-1] < 0 and macd_diff[-2] >= 0 and 
+                  macd_line[-1] < macd_signal[-1]):
                 signals.append('sell')
                 reasons.append('MACD bearish crossover')
             
             # EMA crossover
-            if (ema50.iloc[-1] > ema200.iloc[-1] and ema50.iloc[-2] <= ema200.iloc[-2]):
+            if (ema50[-1] > ema200[-1] and ema50[-2] <= ema200[-2]):
                 signals.append('buy')
                 reasons.append('EMA50 crossed above EMA200')
-            elif (ema50.iloc[-1] < ema200.iloc[-1] and ema50.iloc[-2] >= ema200.iloc[-2]):
+            elif (ema50[-1] < ema200[-1] and ema50[-2] >= ema200[-2]):
                 signals.append('sell')
                 reasons.append('EMA50 crossed below EMA200')
             
-            # Volume confirmation
-            if volume_profile['volume_ratio'] >= STRATEGY_CONFIG['volume_threshold']:
-                if signals:
-                    reasons.append(f"Volume confirmed: {volume_profile['volume_ratio']:.2f}x")
-            else:
-                reasons.append(f"Insufficient volume: {volume_profile['volume_ratio']:.2f}x")
+            # Volume confirmation (the gate above already passed)
+            if signals:
+                reasons.append(f"Volume confirmed: {volume_profile['volume_ratio']:.2f}x")
             
             buy_signals = signals.count('buy')
             sell_signals = signals.count('sell')
             
-            if buy_signals >= 2 and volume_profile['volume_ratio'] >= STRATEGY_CONFIG['volume_threshold']:
+            if buy_signals >= 2:
                 return {'signal': 'buy', 'strength': buy_signals, 'reasons': reasons}
-            elif sell_signals >= 2 and volume_profile['volume_ratio'] >= STRATEGY_CONFIG['volume_threshold']:
+            elif sell_signals >= 2:
                 return {'signal': 'sell', 'strength': sell_signals, 'reasons': reasons}
             else:
                 return {'signal': 'none', 'strength': max(buy_signals, sell_signals), 'reasons': reasons}
@@ -192,31 +493,32 @@ class AdvancedStrategy:
             logging.error(f"Error in MACD-EMA-Volume strategy for {symbol}: {str(e)}")
             return {'signal': 'none', 'strength': 0, 'reasons': [f'Error: {str(e)}']}
     
-    def stochastic_fibonacci_trend_strategy(self, symbol: str) -> Dict[str, any]:
+    def stochastic_fibonacci_trend_strategy(self, symbol: str, kl: Optional[pd.DataFrame] = None,
+                                            bundle: Optional[IndicatorBundle] = None) -> Dict[str, any]:
         """Stochastic + Fibonacci + Trend strategy"""
         try:
-            kl = binance_client.get_klines(symbol, interval=TradingConfig.KLINE_INTERVAL)
+            if kl is None:
+                kl = self._cached_klines(symbol)
             if kl is None or len(kl) < 50:
                 return {'signal': 'none', 'strength': 0, 'reasons': []}
-            
-            # Technical indicators
-            stoch_k = ta.momentum.stoch(kl.High, kl.Low, kl.Close)
-            stoch_d = ta.momentum.stoch_signal(kl.High, kl.Low, kl.Close)
+            if bundle is None:
+                bundle = self._compute_indicator_bundle(kl)
+
+            stoch_k, stoch_d = bundle.stoch_k.values, bundle.stoch_d.values
             fib_levels = self.calculate_fibonacci_levels(kl)
-            ema100 = ta.trend.ema_indicator(kl.Close, window=100)
-            atr = ta.volatility.average_true_range(kl.High, kl.Low, kl.Close)
+            ema100 = bundle.ema100.values
             
-            current_price = kl.Close.iloc[-1]
+            current_price = kl.Close.values[-1]
             signals = []
             reasons = []
             
             # Stochastic signals
-            if (stoch_k.iloc[-1] < 20 and stoch_k.iloc[-2] >= 20 and 
-                stoch_k.iloc[-1] > stoch_d.iloc[-1]):
+            if (stoch_k[-1] < 20 and stoch_k[-2] >= 20 and 
+                stoch_k[-1] > stoch_d[-1]):
                 signals.append('buy')
                 reasons.append('Stochastic oversold reversal')
-            elif (stoch_k.iloc[-1] > 80 and stoch_k.iloc[-2] <= 80 and 
-                  stoch_k.iloc[-1] < stoch_d.iloc[-1]):
+            elif (stoch_k[-1] > 80 and stoch_k[-2] <= 80 and 
+                  stoch_k[-1] < stoch_d[-1]):
                 signals.append('sell')
                 reasons.append('Stochastic overbought reversal')
             
@@ -229,7 +531,7 @@ class AdvancedStrategy:
                 reasons.append('Price near Fibonacci 38.2% retracement')
             
             # Trend confirmation
-            if current_price > ema100.iloc[-1]:
+            if current_price > ema100[-1]:
                 if 'sell' in signals:
                     reasons.append('Trend filter: against bullish trend')
             else:
@@ -240,8 +542,8 @@ class AdvancedStrategy:
             sell_signals = signals.count('sell')
             
             # Trend alignment check
-            trend_aligned = ((current_price > ema100.iloc[-1] and buy_signals > 0) or 
-                           (current_price < ema100.iloc[-1] and sell_signals > 0))
+            trend_aligned = ((current_price > ema100[-1] and buy_signals > 0) or 
+                           (current_price < ema100[-1] and sell_signals > 0))
             
             if buy_signals >= 2 and trend_aligned:
                 return {'signal': 'buy', 'strength': buy_signals, 'reasons': reasons}
@@ -254,98 +556,92 @@ class AdvancedStrategy:
             logging.error(f"Error in Stoch-Fib-Trend strategy for {symbol}: {str(e)}")
             return {'signal': 'none', 'strength': 0, 'reasons': [f'Error: {str(e)}']}
     
+    # Strategy-name dispatch for the live signal functions
+    _STRATEGY_FUNCS = {
+        'rsi_bb_vwap': rsi_bollinger_vwap_strategy,
+        'macd_ema_vol': macd_ema_volume_strategy,
+        'stoch_fib_trend': stochastic_fibonacci_trend_strategy,
+    }
+
+    def compute_all_signals(self, symbol: str, kl: Optional[pd.DataFrame] = None,
+                            bundle: Optional[IndicatorBundle] = None) -> Dict[str, Dict]:
+        """Evaluate every strategy on one shared indicator pass.
+
+        The OHLCV arrays and the bundle stay hot in cache across the three
+        condition sets instead of each strategy traversing the frame on
+        its own.
+        """
+        if bundle is None and kl is not None and len(kl) >= 50:
+            bundle = self._compute_indicator_bundle(kl)
+        return {name: func(self, symbol, kl, bundle)
+                for name, func in self._STRATEGY_FUNCS.items()}
+
     def backtest_strategy(self, symbol: str, strategy_name: str, days: int = 30) -> BacktestResult:
-        """Backtest a strategy on historical data"""
+        """Backtest a strategy on historical data.
+
+        Results only change when a new bar closes, so delegate to a cached
+        helper keyed on a 15-minute bucket: repeated signal queries within
+        the same window skip the kline refetch and the full simulation.
+        """
+        bucket = int(time.time()) // 900
+        result = self._backtest_cached(symbol, strategy_name, days, bucket)
+        self.backtest_results[(symbol, strategy_name)] = (bucket, result.score)
+        return result
+
+    @lru_cache(maxsize=512)
+    def _backtest_cached(self, symbol: str, strategy_name: str, days: int, bucket: int) -> BacktestResult:
+        """Uncached backtest body; `bucket` exists only to expire the cache"""
         try:
             # Get historical data
             end_time = datetime.now()
             start_time = end_time - timedelta(days=days)
             
-            hist_data = pd.DataFrame(binance_client.client.klines(
+            # One-pass parse via the shared converter instead of building
+            # an object DataFrame and reshaping/recasting it in five steps
+            hist_data = klines_to_dataframe(binance_client.client.klines(
                 symbol, TradingConfig.KLINE_INTERVAL, 
                 startTime=int(start_time.timestamp() * 1000),
                 endTime=int(end_time.timestamp() * 1000),
                 limit=1000
             ))
             
-            if hist_data.empty or len(hist_data.columns) < 6:
+            if hist_data is None or hist_data.empty:
                 return BacktestResult(symbol, strategy_name, 0, 0, 0, 0, 0, 0, 0, 0)
             
-            hist_data = hist_data.iloc[:, :6]
-            hist_data.columns = ['Time', 'Open', 'High', 'Low', 'Close', 'Volume']
-            hist_data = hist_data.set_index('Time')
-            hist_data.index = pd.to_datetime(hist_data.index, unit='ms')
-            hist_data = hist_data.astype(float)
-            
-            # Simulate trading
-            trades = []
-            position = None
-            entry_price = 0
-            
-            for i in range(200, len(hist_data) - 1):
-                current_data = hist_data.iloc[:i+1]
-                
-                # Get strategy signal
-                if strategy_name == 'rsi_bb_vwap':
-                    signal_data = self._simulate_rsi_bb_vwap(current_data)
-                elif strategy_name == 'macd_ema_vol':
-                    signal_data = self._simulate_macd_ema_vol(current_data)
-                elif strategy_name == 'stoch_fib_trend':
-                    signal_data = self._simulate_stoch_fib_trend(current_data)
-                else:
-                    continue
-                
-                signal = signal_data['signal']
-                current_price = current_data.Close.iloc[-1]
-                
-                # Execute trades
-                if position is None and signal in ['buy', 'sell']:
-                    position = signal
-                    entry_price = current_price
-                    
-                elif position is not None:
-                    pnl_pct = 0
-                    if position == 'buy':
-                        pnl_pct = (current_price - entry_price) / entry_price
-                    else:
-                        pnl_pct = (entry_price - current_price) / entry_price
-                    
-                    # Exit on TP/SL or opposite signal
-                    if pnl_pct >= TradingConfig.TAKE_PROFIT or pnl_pct <= -TradingConfig.STOP_LOSS or signal != position:
-                        trades.append({
-                            'entry_price': entry_price,
-                            'exit_price': current_price,
-                            'position': position,
-                            'pnl_pct': pnl_pct,
-                            'profit': pnl_pct > 0
-                        })
-                        position = None
-            
+            # Indicators once over the whole series, then one tight pass
+            # over raw arrays — the old per-bar iloc[:i+1] rerun of the
+            # full indicator stack was O(N^2)
+            signal_generator = self._SIGNAL_GENERATORS.get(strategy_name)
+            if signal_generator is None:
+                return BacktestResult(symbol, strategy_name, 0, 0, 0, 0, 0, 0, 0, 0)
+            signals = signal_generator(self, hist_data)
+
+            closes = hist_data.Close.values
+
+            # Trade execution is inherently sequential; run it as a numba
+            # kernel (plain Python without numba) over the raw arrays
+            pnls = indicators_nb.simulate_trades(
+                closes, signals, TradingConfig.TAKE_PROFIT, TradingConfig.STOP_LOSS, 200)
+
             # Calculate statistics
-            if not trades:
+            if pnls.size == 0:
                 return BacktestResult(symbol, strategy_name, 0, 0, 0, 0, 0, 0, 0, 0)
-            
-            total_trades = len(trades)
-            winning_trades = sum(1 for t in trades if t['profit'])
+
+            total_trades = int(pnls.size)
+            winning_trades = int((pnls > 0).sum())
             losing_trades = total_trades - winning_trades
-            win_rate = winning_trades / total_trades if total_trades > 0 else 0
-            total_pnl = sum(t['pnl_pct'] for t in trades)
+            win_rate = winning_trades / total_trades
+            total_pnl = float(pnls.sum())
             
-            # Calculate max drawdown
-            cumulative_pnl = 0
-            peak = 0
-            max_drawdown = 0
-            for trade in trades:
-                cumulative_pnl += trade['pnl_pct']
-                if cumulative_pnl > peak:
-                    peak = cumulative_pnl
-                drawdown = (peak - cumulative_pnl) / (1 + peak) if peak > 0 else 0
-                max_drawdown = max(max_drawdown, drawdown)
+            # Calculate max drawdown (running peak via maximum.accumulate)
+            cumulative = pnls.cumsum()
+            peak = np.maximum.accumulate(cumulative)
+            drawdowns = np.where(peak > 0, (peak - cumulative) / (1 + peak), 0.0)
+            max_drawdown = float(drawdowns.max())
             
             # Calculate Sharpe ratio
-            returns = [t['pnl_pct'] for t in trades]
-            if len(returns) > 1 and np.std(returns) > 0:
-                sharpe_ratio = np.mean(returns) / np.std(returns) * np.sqrt(len(returns))
+            if pnls.size > 1 and np.std(pnls) > 0:
+                sharpe_ratio = np.mean(pnls) / np.std(pnls) * np.sqrt(pnls.size)
             else:
                 sharpe_ratio = 0
             
@@ -375,74 +671,103 @@ class AdvancedStrategy:
             logging.error(f"Backtest error for {symbol} {strategy_name}: {str(e)}")
             return BacktestResult(symbol, strategy_name, 0, 0, 0, 0, 0, 0, 0, 0)
     
-    def _simulate_rsi_bb_vwap(self, data):
-        """Simulate RSI+BB+VWAP strategy for backtesting"""
-        rsi = ta.momentum.RSIIndicator(data.Close).rsi()
-        if len(rsi) < 2:
-            return {'signal': 'none'}
-        
-        if rsi.iloc[-1] < 30 and rsi.iloc[-2] >= 30:
-            return {'signal': 'buy'}
-        elif rsi.iloc[-1] > 70 and rsi.iloc[-2] <= 70:
-            return {'signal': 'sell'}
-        return {'signal': 'none'}
-    
-    def _simulate_macd_ema_vol(self, data):
-        """Simulate MACD+EMA+Volume strategy for backtesting"""
-        macd_diff = ta.trend.macd_diff(data.Close)
-        if len(macd_diff) < 2:
-            return {'signal': 'none'}
-        
-        if macd_diff.iloc[-1] > 0 and macd_diff.iloc[-2] <= 0:
-            return {'signal': 'buy'}
-        elif macd_diff.iloc[-1] < 0 and macd_diff.iloc[-2] >= 0:
-            return {'signal': 'sell'}
-        return {'signal': 'none'}
-    
-    def _simulate_stoch_fib_trend(self, data):
-        """Simulate Stoch+Fib+Trend strategy for backtesting"""
-        stoch_k = ta.momentum.stoch(data.High, data.Low, data.Close)
-        if len(stoch_k) < 2:
-            return {'signal': 'none'}
-        
-        if stoch_k.iloc[-1] < 20 and stoch_k.iloc[-2] >= 20:
-            return {'signal': 'buy'}
-        elif stoch_k.iloc[-1] > 80 and stoch_k.iloc[-2] <= 80:
-            return {'signal': 'sell'}
-        return {'signal': 'none'}
+    @staticmethod
+    def _crossover_signals(values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+        """Per-bar crossover signals: 1 on a cross below lower, -1 above upper"""
+        prev = np.roll(values, 1)
+        signals = np.zeros(len(values), dtype=np.int8)
+        signals[(values < lower) & (prev >= lower)] = 1
+        signals[(values > upper) & (prev <= upper)] = -1
+        signals[0] = 0
+        return signals
+
+    def _signals_rsi_bb_vwap(self, data: pd.DataFrame) -> np.ndarray:
+        """RSI crossover signal array for backtesting"""
+        return self._crossover_signals(rsi_series(data.Close).values, 30, 70)
+
+    def _signals_macd_ema_vol(self, data: pd.DataFrame) -> np.ndarray:
+        """MACD histogram zero-cross signal array for backtesting"""
+        _, _, macd_diff = macd_series(data.Close)
+        diff = macd_diff.values
+        prev = np.roll(diff, 1)
+        signals = np.zeros(len(diff), dtype=np.int8)
+        signals[(diff > 0) & (prev <= 0)] = 1
+        signals[(diff < 0) & (prev >= 0)] = -1
+        signals[0] = 0
+        return signals
+
+    def _signals_stoch_fib_trend(self, data: pd.DataFrame) -> np.ndarray:
+        """Stochastic %K crossover signal array for backtesting"""
+        stoch_k, _ = stoch_series(data.High, data.Low, data.Close)
+        return self._crossover_signals(stoch_k.values, 20, 80)
+
+    # Strategy-name dispatch for the backtest signal generators
+    _SIGNAL_GENERATORS = {
+        'rsi_bb_vwap': _signals_rsi_bb_vwap,
+        'macd_ema_vol': _signals_macd_ema_vol,
+        'stoch_fib_trend': _signals_stoch_fib_trend,
+    }
     
-    def get_best_strategy_signal(self, symbol: str) -> Dict[str, any]:
+    def get_best_strategy_signal(self, symbol: str, kl: Optional[pd.DataFrame] = None) -> Dict[str, any]:
         """Get the best signal from all strategies with backtesting validation"""
         try:
+            if kl is None:
+                kl = self._cached_klines(symbol)
+            # One shared indicator pass feeds every strategy below
+            bundle = self._compute_indicator_bundle(kl) if kl is not None and len(kl) >= 50 else None
+
             if STRATEGY_CONFIG['backtesting_enabled']:
-                strategies = {
-                    'rsi_bb_vwap': self.rsi_bollinger_vwap_strategy,
-                    'macd_ema_vol': self.macd_ema_volume_strategy,
-                    'stoch_fib_trend': self.stochastic_fibonacci_trend_strategy
-                }
-                
                 best_score = 0
                 best_signal = {'signal': 'none', 'strength': 0, 'reasons': []}
-                
-                for strategy_name, strategy_func in strategies.items():
-                    signal_data = strategy_func(symbol)
-                    
-                    if signal_data['signal'] != 'none':
-                        backtest_result = self.backtest_strategy(symbol, strategy_name)
-                        
-                        if backtest_result.score >= STRATEGY_CONFIG['min_backtest_score']:
-                            if backtest_result.score > best_score:
-                                best_score = backtest_result.score
-                                best_signal = signal_data
-                                best_signal['backtest_score'] = backtest_result.score
-                                best_signal['strategy'] = strategy_name
-                                
-                        logging.info(f"{symbol} {strategy_name}: Signal={signal_data['signal']}, "
-                                   f"Score={backtest_result.score:.1f}")
-                
+
+                # Signals are cheap with the shared bundle; compute them
+                # first, then backtest only the firing strategies in
+                # parallel (each backtest blocks on its own kline fetch)
+                signal_map = self.compute_all_signals(symbol, kl, bundle)
+                firing = [name for name, data in signal_map.items()
+                          if data['signal'] != 'none']
+
+                # Early exit: rank firing strategies by their last known
+                # backtest score, and if the strongest one already has a
+                # qualifying score for the current bar bucket, take its
+                # signal without touching the others
+                firing.sort(key=lambda name: self.backtest_results.get((symbol, name), (None, 0.0))[1],
+                            reverse=True)
+                if firing:
+                    cached = self.backtest_results.get((symbol, firing[0]))
+                    if (cached and cached[0] == int(time.time()) // 900
+                            and cached[1] >= STRATEGY_CONFIG['min_backtest_score']):
+                        best_signal = signal_map[firing[0]]
+                        best_signal['backtest_score'] = cached[1]
+                        best_signal['strategy'] = firing[0]
+                        return best_signal
+
+                backtests = {}
+                if len(firing) > 1:
+                    with ThreadPoolExecutor(max_workers=len(firing)) as executor:
+                        futures = {name: executor.submit(self.backtest_strategy, symbol, name)
+                                   for name in firing}
+                        backtests = {name: future.result() for name, future in futures.items()}
+                elif firing:
+                    backtests[firing[0]] = self.backtest_strategy(symbol, firing[0])
+
+                for strategy_name in firing:
+                    signal_data = signal_map[strategy_name]
+                    backtest_result = backtests[strategy_name]
+
+                    if backtest_result.score >= STRATEGY_CONFIG['min_backtest_score']:
+                        if backtest_result.score > best_score:
+                            best_score = backtest_result.score
+                            best_signal = signal_data
+                            best_signal['backtest_score'] = backtest_result.score
+                            best_signal['strategy'] = strategy_name
+
+                    logging.info(f"{symbol} {strategy_name}: Signal={signal_data['signal']}, "
+                               f"Score={backtest_result.score:.1f}")
+
                 return best_signal
             else:
-                return self.rsi_bollinger_vwap_strategy(symbol)
+                return self.rsi_bollinger_vwap_strategy(symbol, kl, bundle)
                 
         except Exception as e:
             logging.error(f"Error getting best strategy signal for {symbol}: {str(e)}")
@@ -1,35 +1,78 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
-import json
+import orjson
 import logging
 from typing import Dict, List, Optional
 from dataclasses import asdict
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 class StrategyAnalyzer:
     """Advanced strategy analysis and performance monitoring"""
     
-    def __init__(self, results_file='backtest_results.json'):
+    def __init__(self, results_file='backtest_results.json', results_dir='backtest_results'):
         self.results_file = results_file
+        self.results_dir = results_dir
         self.results_history = self.load_results_history()
+        self._df_cache = None
     
     def load_results_history(self) -> List[Dict]:
         """Load historical backtest results"""
+        if PYARROW_AVAILABLE and os.path.isdir(self.results_dir):
+            try:
+                frames = [pd.read_parquet(os.path.join(self.results_dir, name))
+                          for name in sorted(os.listdir(self.results_dir))
+                          if name.endswith('.parquet')]
+                if frames:
+                    return pd.concat(frames, ignore_index=True).to_dict('records')
+            except Exception as e:
+                logging.error(f"Error loading parquet results: {e}")
         try:
-            with open(self.results_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
+            with open(self.results_file, 'rb') as f:
+                return orjson.loads(f.read())
+        except (FileNotFoundError, ValueError):
             return []
-    
+
     def save_results_history(self):
-        """Save backtest results to file"""
+        """Save backtest results to disk.
+
+        With pyarrow installed the history is partitioned into one
+        Parquet file per day and an append only rewrites the current
+        day's partition; without it the whole history is rewritten as
+        JSON on every save. The very first Parquet save backfills every
+        day from the in-memory history, so records migrated from a
+        legacy JSON file carry over instead of being dropped.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                first_save = not os.path.isdir(self.results_dir)
+                today = datetime.now().strftime('%Y-%m-%d')
+                by_day = {}
+                for r in self.results_history:
+                    day = str(r.get('timestamp', ''))[:10]
+                    if day and (first_save or day == today):
+                        by_day.setdefault(day, []).append(r)
+                if by_day:
+                    os.makedirs(self.results_dir, exist_ok=True)
+                    for day, records in by_day.items():
+                        pd.DataFrame(records).to_parquet(
+                            os.path.join(self.results_dir, f'{day}.parquet'))
+                    return
+            except Exception as e:
+                logging.error(f"Error saving parquet results: {e}")
         try:
-            with open(self.results_file, 'w') as f:
-                json.dump(self.results_history, f, indent=2, default=str)
+            with open(self.results_file, 'wb') as f:
+                f.write(orjson.dumps(self.results_history, option=orjson.OPT_INDENT_2, default=str))
         except Exception as e:
             logging.error(f"Error saving results: {e}")
     
@@ -38,20 +81,44 @@ class StrategyAnalyzer:
         result_dict = asdict(result) if hasattr(result, '__dict__') else result
         result_dict['timestamp'] = datetime.now().isoformat()
         self.results_history.append(result_dict)
+        self._df_cache = None
         self.save_results_history()
     
+    def _build_results_df(self) -> pd.DataFrame:
+        """Results history as a typed DataFrame.
+
+        Building straight from the list of dicts leaves symbol/strategy as
+        object columns and every numeric as float64; categoricals and
+        downcast floats keep large histories small and make the groupbys
+        cheaper.
+        """
+        if self._df_cache is not None:
+            return self._df_cache
+        df = pd.DataFrame(self.results_history)
+        if df.empty:
+            self._df_cache = df
+            return df
+        for col in ('strategy', 'symbol'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        for col in df.select_dtypes(include='float').columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+        self._df_cache = df
+        return df
+
     def analyze_strategy_performance(self, strategy_name: str, days: int = 30) -> Dict:
         """Analyze performance of a specific strategy"""
-        recent_results = [
-            r for r in self.results_history 
-            if r.get('strategy') == strategy_name and 
-            datetime.fromisoformat(r['timestamp']) >= datetime.now() - timedelta(days=days)
-        ]
-        
-        if not recent_results:
+        history = self._build_results_df()
+        if history.empty:
+            return {}
+
+        cutoff = datetime.now() - timedelta(days=days)
+        df = history[(history['strategy'] == strategy_name) & (history['timestamp'] >= cutoff)]
+
+        if df.empty:
             return {}
-        
-        df = pd.DataFrame(recent_results)
         
         analysis = {
             'strategy': strategy_name,
@@ -74,7 +141,7 @@ class StrategyAnalyzer:
         if not self.results_history:
             return "No backtest results available."
         
-        df = pd.DataFrame(self.results_history)
+        df = self._build_results_df()
         
         report = f"""
 === TRADING STRATEGY PERFORMANCE REPORT ===
@@ -111,33 +178,35 @@ STRATEGY COMPARISON:
             logging.warning("No data available for plotting")
             return
         
-        df = pd.DataFrame(self.results_history)
+        df = self._build_results_df()
         
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        
-        # Score comparison
-        df.boxplot(column='score', by='strategy', ax=axes[0,0])
-        axes[0,0].set_title('Score Distribution by Strategy')
-        axes[0,0].set_xlabel('Strategy')
-        axes[0,0].set_ylabel('Score')
-        
-        # Win rate comparison
-        df.boxplot(column='win_rate', by='strategy', ax=axes[0,1])
-        axes[0,1].set_title('Win Rate Distribution by Strategy')
-        axes[0,1].set_xlabel('Strategy')
-        axes[0,1].set_ylabel('Win Rate')
-        
-        # PnL comparison
-        df.boxplot(column='total_pnl', by='strategy', ax=axes[1,0])
-        axes[1,0].set_title('PnL Distribution by Strategy')
-        axes[1,0].set_xlabel('Strategy')
-        axes[1,0].set_ylabel('Total PnL')
-        
-        # Max drawdown comparison
-        df.boxplot(column='max_drawdown', by='strategy', ax=axes[1,1])
-        axes[1,1].set_title('Max Drawdown Distribution by Strategy')
-        axes[1,1].set_xlabel('Strategy')
-        axes[1,1].set_ylabel('Max Drawdown')
+
+        # One groupby pass for all four metrics; df.boxplot(by=...) would
+        # rerun the grouping and sorting once per subplot
+        metrics = [
+            ('score', 'Score Distribution by Strategy', 'Score'),
+            ('win_rate', 'Win Rate Distribution by Strategy', 'Win Rate'),
+            ('total_pnl', 'PnL Distribution by Strategy', 'Total PnL'),
+            ('max_drawdown', 'Max Drawdown Distribution by Strategy', 'Max Drawdown'),
+        ]
+        cols = [m[0] for m in metrics]
+        quantiles = df.groupby('strategy', observed=True)[cols].quantile([0, 0.25, 0.5, 0.75, 1.0]).unstack()
+        strategy_names = quantiles.index.tolist()
+
+        for ax, (col, title, ylabel) in zip(axes.flat, metrics):
+            boxes = [{'label': name,
+                      'whislo': quantiles.loc[name, (col, 0.0)],
+                      'q1': quantiles.loc[name, (col, 0.25)],
+                      'med': quantiles.loc[name, (col, 0.5)],
+                      'q3': quantiles.loc[name, (col, 0.75)],
+                      'whishi': quantiles.loc[name, (col, 1.0)],
+                      'fliers': []}
+                     for name in strategy_names]
+            ax.bxp(boxes, showfliers=False)
+            ax.set_title(title)
+            ax.set_xlabel('Strategy')
+            ax.set_ylabel(ylabel)
         
         plt.tight_layout()
         plt.savefig(save_path)
@@ -150,11 +219,11 @@ STRATEGY COMPARISON:
         if not self.results_history:
             return {'recommendations': ['No data available for recommendations']}
         
-        df = pd.DataFrame(self.results_history)
+        df = self._build_results_df()
         recommendations = []
         
         # Analyze recent performance (last 7 days)
-        recent_df = df[pd.to_datetime(df['timestamp']) >= datetime.now() - timedelta(days=7)]
+        recent_df = df[df['timestamp'] >= datetime.now() - timedelta(days=7)]
         
         if not recent_df.empty:
             best_strategy = recent_df.groupby('strategy')['score'].mean().idxmax()
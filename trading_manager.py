@@ -1,118 +1,156 @@
 import logging
-from time import sleep
+import math
+import uuid
+from time import monotonic
 from config import TradingConfig
 from binance_client import binance_client
+from market_stream import market_stream
 from notifications import notifier
 
+def _snap(value, grid_inv, precision, up=False):
+    """Snap a price or quantity onto the symbol's tick/step grid.
+
+    Integer grid arithmetic keeps values on exact tickSize/stepSize
+    multiples; decimal rounding remains the fallback when the exchange
+    filters are unavailable.
+    """
+    if grid_inv:
+        scaled = value * grid_inv
+        return (math.ceil(scaled) if up else math.floor(scaled)) / grid_inv
+    return round(value, precision)
+
+# Minimum seconds between two entries on the same symbol (one scan cycle)
+ORDER_COOLDOWN = 180
+
 class TradingManager:
     """Handle order placement and position management"""
     
     def __init__(self):
         self.last_symbol = ''
+        self._recent_entries = {}  # symbol -> monotonic time of last entry
     
-    def open_order(self, symbol, side):
-        """Enhanced order placement with validation"""
+    def open_order(self, symbol, side, balance=None):
+        """Enhanced order placement with validation.
+
+        `balance` lets the caller pass the figure it already fetched this
+        cycle so the hot path skips a blocking account round-trip.
+        """
         if not binance_client.validate_symbol(symbol) or side not in ['buy', 'sell']:
-            logging.error(f"Invalid order parameters: {symbol}, {side}")
+            logging.error("Invalid order parameters: %s, %s", symbol, side)
+            return False
+
+        # Reject duplicate entry intents locally before spending any
+        # network calls on a symbol that just opened a position
+        last_entry = self._recent_entries.get(symbol)
+        if last_entry is not None and monotonic() - last_entry < ORDER_COOLDOWN:
+            logging.info("Skipping %s: entry cooldown active", symbol)
             return False
         
         try:
-            # Get current price using new method
-            price = binance_client.get_current_price(symbol)
+            # Streamed price first (a dict read); REST only when the
+            # stream has no fresh tick for this symbol
+            price = market_stream.get_price(symbol, max_age=5.0)
+            if price is None:
+                price = binance_client.get_current_price(symbol)
             if not price or price <= 0:
-                logging.error(f"Could not get price for {symbol}")
+                logging.error("Could not get price for %s", symbol)
                 notifier.notify_error(f"Could not get price for {symbol}", "Order placement")
                 return False
             
-            logging.info(f"Current price for {symbol}: {price}")
-            
-            # Get precision
-            qty_precision = binance_client.get_qty_precision(symbol)
-            price_precision = binance_client.get_price_precision(symbol)
+            logging.info("Current price for %s: %s", symbol, price)
             
+            # Get both precisions from one snapshot lookup
+            qty_precision, price_precision = binance_client.get_precisions(symbol)
+
             if qty_precision is None or price_precision is None:
-                logging.error(f"Could not get precision for {symbol}")
+                logging.error("Could not get precision for %s", symbol)
                 return False
             
+            tick_inv, step_inv = binance_client.get_tick_inverses(symbol)
+
+            # Fast-fail against the symbol's exchange filters before any
+            # further work: both limits come from the cached snapshot
+            min_qty, min_notional = binance_client.get_min_order_limits(symbol)
+            min_notional = min_notional or 5.0  # USDT
+
             # Calculate quantity with better validation
             calculated_qty = TradingConfig.VOLUME / price
-            qty = round(calculated_qty, qty_precision)
-            
-            # More lenient order size validation
-            min_notional = 5.0  # USDT
+            qty = _snap(calculated_qty, step_inv, qty_precision)
             order_value = qty * price
             
             if qty <= 0:
-                logging.error(f"Invalid quantity for {symbol}: {qty}")
+                logging.error("Invalid quantity for %s: %s", symbol, qty)
+                return False
+
+            if min_qty and qty < min_qty:
+                logging.error("Quantity below exchange minimum for %s: %s < %s", symbol, qty, min_qty)
                 return False
             
             if order_value < min_notional:
-                # Adjust quantity to meet minimum
-                qty = round(min_notional / price, qty_precision)
+                # Adjust quantity to meet minimum (snapping up, so the
+                # adjusted order cannot land back below the floor)
+                qty = _snap(min_notional / price, step_inv, qty_precision, up=True)
                 order_value = qty * price
-                logging.info(f"Adjusted quantity for {symbol} to meet minimum: {qty}")
+                logging.info("Adjusted quantity for %s to meet minimum: %s", symbol, qty)
             
             # Validate against balance (more lenient)
-            balance = binance_client.get_balance_usdt()
+            if balance is None:
+                balance = binance_client.get_balance_usdt()
             if balance and order_value > balance * 0.8:  # Use 80% instead of 10%
-                logging.error(f"Order size too large for {symbol}: {order_value} > {balance * 0.8}")
+                logging.error("Order size too large for %s: %s > %s", symbol, order_value, balance * 0.8)
                 return False
             
-            logging.info(f"Placing order: {symbol} {side} qty={qty} value={order_value:.2f} USDT")
-            
-            # Place main order
-            order_side = 'BUY' if side == 'buy' else 'SELL'
-            resp1 = binance_client.place_order(symbol, order_side, qty)
-            
-            if not resp1:
+            logging.info("Placing order: %s %s qty=%s value=%.2f USDT", symbol, side, qty, order_value)
+
+            # Compute SL/TP up front so all three legs go in one request;
+            # the per-side multipliers are precomputed in config
+            sl_mult, tp_mult = TradingConfig.PRICE_MULT[side]
+            if side == 'buy':
+                order_side, exit_side = 'BUY', 'SELL'
+            else:
+                order_side, exit_side = 'SELL', 'BUY'
+            sl_price = _snap(price * sl_mult, tick_inv, price_precision, up=sl_mult > 1)
+            tp_price = _snap(price * tp_mult, tick_inv, price_precision, up=tp_mult > 1)
+
+            # One signed batchOrders request: main + SL + TP in a single
+            # RTT; per-leg client order ids make a retry after an ambiguous
+            # failure (timeout after send) safe to reconcile
+            order_tag = uuid.uuid4().hex[:16]
+            batch = [
+                {'symbol': symbol, 'side': order_side, 'type': 'MARKET',
+                 'quantity': str(qty), 'newClientOrderId': f'bot-{order_tag}-m'},
+                {'symbol': symbol, 'side': exit_side, 'type': 'STOP_MARKET',
+                 'quantity': str(qty), 'stopPrice': str(sl_price), 'reduceOnly': 'true',
+                 'newClientOrderId': f'bot-{order_tag}-sl'},
+                {'symbol': symbol, 'side': exit_side, 'type': 'TAKE_PROFIT_MARKET',
+                 'quantity': str(qty), 'stopPrice': str(tp_price), 'reduceOnly': 'true',
+                 'newClientOrderId': f'bot-{order_tag}-tp'},
+            ]
+            responses = binance_client.place_batch_orders(batch)
+            if not responses or not isinstance(responses, list):
                 return False
-            
-            logging.info(f"Order placed for {symbol} {side}: {resp1}")
+
+            main_resp = responses[0]
+            if 'orderId' not in main_resp:
+                logging.error("Main order rejected for %s: %s", symbol, main_resp)
+                # Cancel any protective legs that were accepted without a fill
+                for resp in responses[1:]:
+                    if isinstance(resp, dict) and 'orderId' in resp:
+                        binance_client.cancel_order(symbol, resp['orderId'])
+                return False
+
+            self.last_symbol = symbol
+            self._recent_entries[symbol] = monotonic()
+
+            logging.info("Order placed for %s %s: %s", symbol, side, main_resp)
             notifier.notify_order_placed(symbol, side, qty, price)
-            
-            sleep(2)
-            
-            # Set stop loss and take profit with better error handling
-            try:
-                # Ensure take_profit covers fees and is profitable
-                effective_take_profit = max(
-                    TradingConfig.TAKE_PROFIT, 
-                    TradingConfig.STOP_LOSS + TradingConfig.BINANCE_FEE + 0.001 # min profit
-                )
-
-                if side == 'buy':
-                    sl_price = round(price * (1 - TradingConfig.STOP_LOSS), price_precision)
-                    tp_price = round(price * (1 + effective_take_profit), price_precision)
-                    sl_side, tp_side = 'SELL', 'SELL'
-                else:
-                    sl_price = round(price * (1 + TradingConfig.STOP_LOSS), price_precision)
-                    tp_price = round(price * (1 - effective_take_profit), price_precision)
-                    sl_side, tp_side = 'BUY', 'BUY'
-                
-                # Place stop loss
-                resp2 = binance_client.place_order(
-                    symbol, sl_side, qty, 'STOP_MARKET', stop_price=sl_price
-                )
-                if resp2:
-                    logging.info(f"Stop loss set for {symbol}: {resp2}")
-                else:
-                    logging.warning(f"Failed to set stop loss for {symbol}")
-                
-                sleep(2)
-                
-                # Place take profit
-                resp3 = binance_client.place_order(
-                    symbol, tp_side, qty, 'TAKE_PROFIT_MARKET', stop_price=tp_price
-                )
-                if resp3:
-                    logging.info(f"Take profit set for {symbol}: {resp3}")
+
+            for leg, resp in zip(('Stop loss', 'Take profit'), responses[1:]):
+                if isinstance(resp, dict) and 'orderId' in resp:
+                    logging.info("%s set for %s: %s", leg, symbol, resp)
                 else:
-                    logging.warning(f"Failed to set take profit for {symbol}")
-            
-            except Exception as sl_tp_error:
-                logging.warning(f"Error setting SL/TP for {symbol}: {str(sl_tp_error)}")
-                # Continue anyway since main order was placed
-            
+                    logging.warning("Failed to set %s for %s: %s", leg.lower(), symbol, resp)
+
             return True
             
         except Exception as e: